@@ -0,0 +1,157 @@
+import streamlit as st
+from pathlib import Path
+from PIL import Image, ImageOps, UnidentifiedImageError
+from streamlit.runtime.media_file_storage import MediaFileStorageError
+import html
+from core import media, media_server, repo, session_cookie, storage, telemetry
+
+st.title("📷  포토 앨범  😍")
+st.caption("반려동물과의 소중한 순간을 기록해보세요!")
+
+#로그인 확인
+SESSION_KEY="auth_user"
+session_cookie.restore()
+user=st.session_state.get(SESSION_KEY)
+if not user:
+    st.warning("로그인이 필요합니다.")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
+    st.stop()
+user_id=user["id"]
+
+#미디어 서버 모드 (PETCARE_MEDIA_BASE_URL): 파일 내용 대신 URL만 브라우저로 전달
+media_server.ensure_started()
+
+#사진/영상 업로드 준비 (파일은 core.storage에 내용 해시 이름으로 저장)
+IMAGE_EXTS = media.IMAGE_EXTS
+VIDEO_EXTS = media.VIDEO_EXTS
+ALLOWED_EXTS = IMAGE_EXTS | VIDEO_EXTS
+
+#업로드 기능 화면
+with st.expander("사진/영상 업로드 하기"):
+    with st.form("업로드",clear_on_submit=True):
+        files=st.file_uploader("사진/영상 선택 (복수 선택 가능)", type=list(ALLOWED_EXTS), accept_multiple_files=True)
+        caption=st.text_input("메모 (선택)")
+        submitted=st.form_submit_button("업로드")
+
+        if submitted:
+            if not files:
+                st.warning("사진/영상을 선택해주세요")
+            else:
+                saved=[]
+                for f in files:
+                    ext = Path(f.name).suffix.lower()
+                    if ext not in ALLOWED_EXTS:
+                        continue
+                    staged=None
+                    try:
+                        with telemetry.step("upload.stage"):
+                            staged=storage.stage(f, ext)  #청크 단위로 저장하며 SHA-256 계산
+                        renditions={}
+                        if ext in IMAGE_EXTS:  #방향 보정된 썸네일/확대용 축소본은 업로드 시 한 번만 생성
+                            with telemetry.step("pil.renditions"):
+                                renditions=media.rendition_columns(media.make_renditions(staged.tmp_path, stem=staged.sha256))
+                    except (UnidentifiedImageError, OSError):  #손상/잘린 파일, 확장자만 이미지인 파일
+                        if staged is not None:
+                            storage.discard(staged)
+                        st.warning(f"{f.name}: 파일을 읽을 수 없어 건너뛰었습니다.")
+                        continue
+                    saved.append((staged, renditions))
+                if saved:
+                    repo.add_photos(user_id, saved, caption.strip() or None)  #db저장
+                    st.success(f"업로드 완료")
+                
+st.divider()
+
+#크게 보기
+@st.dialog("크게 보기", width="large")
+def show_lightbox(photo):
+    src=photo.medium_path or photo.file_path
+    st.image(media_server.url_for(src) or str(storage.resolve(src)), use_container_width=True)
+    if photo.caption:
+        st.caption(photo.caption)
+
+#사진/영상 한 칸
+def show_media(photo, ext):
+    if ext in IMAGE_EXTS:
+        if photo.thumb_path:
+            st.image(media_server.url_for(photo.thumb_path) or str(storage.resolve(photo.thumb_path)),
+                     use_container_width=True)
+        else:  #축소본이 아직 없는 예전 사진 (python -m core.media backfill)
+            with Image.open(storage.resolve(photo.file_path)) as img:
+                st.image(ImageOps.exif_transpose(img), use_container_width=True)  #사진 방향 보정
+        if st.button("크게 보기", key=f"view_{photo.id}"):
+            show_lightbox(photo)
+    elif ext in VIDEO_EXTS:
+        url=media_server.url_for(photo.file_path)
+        if url:  #재생 버튼을 누를 때 Range 요청으로 필요한 부분만 받아옴
+            st.html(f'<video controls preload="none" src="{html.escape(url)}" style="width:100%"></video>')
+        else:
+            st.video(str(storage.resolve(photo.file_path)))
+
+#사진 표시 (키셋 페이지네이션: 화면에 보이는 페이지의 사진만 조회/전송)
+PAGE_SIZE=12
+album=st.session_state.get("album")
+if album is None or album["user_id"]!=user_id:  #로그인 사용자가 바뀌면 처음부터
+    album=st.session_state.album={"user_id": user_id, "cursors": [None], "gen": None, "rows": [], "loaded": 0, "next": None}
+mode=st.radio("보기 방식", ["더 보기", "페이지 넘기기"], horizontal=True, key="album_mode")
+cursors=album["cursors"]  #불러온 페이지들의 시작 커서
+
+if mode=="더 보기":
+    #지금까지 불러온 사진을 쌓아 두고 새로 연 페이지만 조회
+    #업로드/삭제로 세대가 바뀌었거나 이전 페이지로 돌아갔으면 같은 페이지 수만큼 처음부터 다시 조회
+    #(예전 커서로 이어 읽으면 페이지 경계가 어긋나 사진이 겹치거나 빠짐)
+    gen=repo.generation(user_id)
+    pages=len(cursors)
+    if album["gen"]!=gen or album["loaded"]>pages:
+        del cursors[1:]
+        album.update(gen=gen, rows=[], loaded=0, next=None)
+    while album["loaded"]<pages:
+        if album["loaded"]==len(cursors):
+            if album["next"] is None:
+                break
+            cursors.append(album["next"])
+        page, album["next"]=repo.list_photos_page(user_id, PAGE_SIZE, after=cursors[album["loaded"]])
+        album["rows"].extend(page)
+        album["loaded"]+=1
+    rows, next_cursor=album["rows"], album["next"]
+else:
+    rows, next_cursor=repo.list_photos_page(user_id, PAGE_SIZE, after=cursors[-1])
+
+
+if not rows:
+    st.info("사진을 업로드해보세요.")
+
+for i in range(0,len(rows),3):
+    cols=st.columns(3)
+    for j, col in enumerate(cols):
+        k=i+j
+        if k>=len(rows):
+            break
+        photo=rows[k]
+        pid,path,cap=photo.id,photo.file_path,photo.caption
+        ext = Path(path).suffix.lower()
+
+        #화면 그리기는 읽기 전용 (파일이 없는 행은 python -m core.reconcile 정리 작업이 삭제)
+        with col:
+            try:
+                show_media(photo, ext)
+            except (OSError, MediaFileStorageError):
+                st.caption("⚠️ 파일을 찾을 수 없습니다.")
+            if cap:
+                st.caption(cap)
+
+           #삭제 기능
+            if st.button("삭제", key=f"del_{pid}"):
+                repo.delete_photo(user_id, pid) #db 삭제 (다른 사진이 같은 파일을 쓰지 않으면 파일도 삭제)
+                st.rerun()
+
+#페이지 이동
+nav1, nav2, _ = st.columns([1,1,4])
+with nav1:
+    if mode=="페이지 넘기기" and len(cursors)>1 and st.button("◀ 이전"):
+        cursors.pop()
+        st.rerun()
+with nav2:
+    if next_cursor is not None and st.button("더 보기" if mode=="더 보기" else "다음 ▶"):
+        cursors.append(next_cursor)
+        st.rerun()
@@ -0,0 +1,117 @@
+import streamlit as st
+from datetime import date
+from core import repo, session_cookie, telemetry
+from core.calendar_view import month_calendar
+
+
+st.title("⏰ 캘린더")
+
+#로그인 확인
+SESSION_KEY = "auth_user"
+session_cookie.restore()
+user = st.session_state.get(SESSION_KEY)
+if not user:
+    st.warning("로그인이 필요합니다.")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
+    st.stop()
+user_id = user["id"]
+
+#오늘 날짜 설정
+today = date.today()
+if "cal_year" not in st.session_state:
+    st.session_state.cal_year, st.session_state.cal_month = today.year, today.month
+y, m = st.session_state.cal_year, st.session_state.cal_month
+
+#월 이동
+c1, c2, c3, c4 = st.columns([1,1,1,6])
+with c1:
+    if st.button("◀ 이전달"):
+        if m == 1:
+            st.session_state.cal_year -= 1
+            st.session_state.cal_month = 12
+        else:
+            st.session_state.cal_month -= 1
+        st.rerun()
+with c2:
+    if st.button("이번달"):
+        st.session_state.cal_year, st.session_state.cal_month = today.year, today.month
+        st.rerun()
+with c3:
+    if st.button("다음달 ▶"):
+        if m == 12:
+            st.session_state.cal_year += 1
+            st.session_state.cal_month = 1
+        else:
+            st.session_state.cal_month += 1
+        st.rerun()
+with c4:
+    st.markdown(f"### {y}년 {m}월")
+
+#캘린더 표시 (월 전체를 HTML 한 덩어리로 그리고 날짜를 클릭하면 선택)
+if "cal_sel_date" not in st.session_state:
+    st.session_state.cal_sel_date = today
+with telemetry.step("calendar.render"):
+    clicked = month_calendar(user_id, y, m, selected=st.session_state.cal_sel_date)
+if clicked:
+    st.session_state.cal_sel_date = clicked
+repo.prefetch_adjacent_months(user_id, y, m)  #◀/▶ 이동용 이전·다음 달 미리 읽기
+
+#일정 등록
+st.divider()
+st.subheader("✍️ 일정 등록 / 삭제")
+colL, colR = st.columns([2,3])
+FREQ_LABELS = {"반복 안 함": None, "매일": "daily", "매주": "weekly", "매월": "monthly", "매년": "yearly"}
+
+
+with colL:
+    sel_date = st.date_input("날짜 선택", key="cal_sel_date")
+    with st.form("add_event_form", clear_on_submit=True):
+        title = st.text_input("일정", placeholder="예: 접종 / 병원 / 미용 / 메모 등")
+        freq_label = st.selectbox("반복", list(FREQ_LABELS.keys()))
+        r1, r2 = st.columns(2)
+        interval = r1.number_input("간격", min_value=1, value=1, step=1, help="예: 2주마다 → 매주 + 간격 2")
+        count = r2.number_input("반복 횟수 (0 = 제한 없음)", min_value=0, value=0, step=1)
+        until = st.date_input("종료일 (선택)", value=None, min_value=sel_date)
+        submit = st.form_submit_button("➕ 등록")
+        if submit:
+            if not title.strip():
+                st.warning("일정을 입력해 주세요.")
+            else:
+                freq = FREQ_LABELS[freq_label]
+                if freq is None:
+                    repo.add_event(user_id, sel_date.isoformat(), title.strip())
+                else:  #반복 일정은 규칙 1건만 저장
+                    repo.add_event_series(user_id, title.strip(), sel_date.isoformat(), freq,
+                                          interval=int(interval),
+                                          until=until.isoformat() if until else None,
+                                          count=int(count) or None)
+                st.success("등록되었습니다.")
+                st.rerun()
+
+#일정삭제
+with colR:
+    st.write(f"**{sel_date.strftime('%Y-%m-%d')} 일정**")
+    rows = repo.list_events_on(user_id, sel_date.isoformat())
+
+    if not rows:
+        st.info("등록된 일정이 없습니다.")
+    else:
+        for ev in rows:
+            if ev.series_id is None:
+                c1, c2 = st.columns([8,1])
+                c1.markdown(f"- **{ev.title}**")
+                if c2.button("삭제", key=f"del-{ev.id}"):
+                    repo.delete_event(user_id, ev.id)
+                    st.success("삭제했습니다.")
+                    st.rerun()
+            else:
+                c1, c2, c3 = st.columns([6,2,2])
+                c1.markdown(f"- **{ev.title}** 🔁")
+                if c2.button("이 날만 삭제", key=f"skip-{ev.series_id}"):
+                    repo.skip_occurrence(user_id, ev.series_id, ev.event_date)
+                    st.success("삭제했습니다.")
+                    st.rerun()
+                if c3.button("반복 전체 삭제", key=f"del-series-{ev.series_id}"):
+                    repo.delete_event_series(user_id, ev.series_id)
+                    st.success("삭제했습니다.")
+                    st.rerun()
@@ -0,0 +1,190 @@
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+from core import charts, compliance, importer, repo, session_cookie, telemetry
+
+st.title("📆 반려동물 일일 기록")
+st.caption("몸무게, 사료량, 음수량, 활동량을 기록하고 적정 여부와 최근 몸무게 변화를 확인합니다.")
+
+#로그인 확인
+SESSION_KEY = "auth_user"
+session_cookie.restore()
+user = st.session_state.get(SESSION_KEY)
+if not user:
+    st.warning("로그인이 필요합니다.")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
+    st.stop()
+user_id = user["id"]
+
+#판정 표시 (판정 기준은 core/compliance.py)
+FLAG_LABELS = {compliance.LOW: "🚨 부족 🚨", compliance.OK: "✅ 적정 ✅", compliance.HIGH: "⚠️ 과다 ⚠️"}
+
+def flag_label(flag) -> str:
+    return FLAG_LABELS.get(flag, "—")
+
+
+#펫 목록
+pets = sorted(repo.list_pets(user_id), key=lambda p: p.name)
+
+if not pets:
+    st.info("등록된 반려동물이 없습니다. 먼저 프로필을 등록해 주세요.")
+    st.stop()
+
+pet_map = {f"{p.name} ({p.species})": (p.id, p.species, p.weight) for p in pets}
+pet_label = st.selectbox("반려동물 선택", list(pet_map.keys()))
+pet_id, pet_species, pet_base_weight = pet_map[pet_label]
+
+#최근 30일 몸무게 급변 알림
+for a in repo.list_weight_alerts(user_id, (date.today() - timedelta(days=30)).isoformat(), pet_id)[:3]:
+    word = "감소" if a.kind == "loss" else "증가"
+    st.warning(f"⚖️ {a.log_date} 몸무게 {a.weight:.1f}kg - 최근 평균 {a.baseline:.1f}kg 대비 {abs(a.pct_change):.1f}% {word}")
+
+with st.form("daily_form"):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        log_date = st.date_input("기록 날짜", value=date.today())
+    with col2:
+        weight = st.number_input("몸무게 (kg)", min_value=0.0, step=0.1, format="%.1f")
+    with col3:
+        food_g = st.number_input("사료량 (g)", min_value=0.0, step=5.0, format="%.1f")
+    with col4:
+        water_ml = st.number_input("음수량 (ml)", min_value=0.0, step=10.0, format="%.1f")
+
+    activity_min = st.number_input("활동량 (분)", min_value=0.0, step=5.0, format="%.1f")
+    notes = st.text_area("메모 (선택)")
+
+    submitted = st.form_submit_button("저장 / 적정량 확인")
+
+if submitted:
+    today_df = pd.DataFrame([{"log_date": log_date.isoformat(), "weight": weight, "food_g": food_g,
+                              "water_ml": water_ml, "activity_min": activity_min}])
+    result = compliance.evaluate(today_df, pet_species).iloc[0]
+
+    st.info(
+        (f"""사료량: **{flag_label(result['flag_food_g'])}** (권장 {result['target_food_g']:.0f} g) |
+        음수량: **{flag_label(result['flag_water_ml'])}** (권장 {result['target_water_ml']:.0f} ml) |
+        활동량: **{flag_label(result['flag_activity_min'])}** (권장 {result['target_activity_min']:.0f} 분)""")
+    )
+
+    #DB 저장
+    repo.upsert_daily_log(user_id, pet_id, log_date.isoformat(),
+                          weight=float(weight),
+                          food_g=float(food_g),
+                          water_ml=float(water_ml),
+                          activity_min=float(activity_min),
+                          notes=notes or None)
+    st.success(f"{pet_label} - {log_date.isoformat()} 기록 저장/업데이트 완료")
+
+#파일로 한꺼번에 가져오기 (스프레드시트, 급식기/체중계 내보내기)
+with st.expander("📥 파일로 기록 가져오기 (CSV / Parquet)"):
+    st.caption("컬럼: " + ", ".join(importer.COLUMNS) + " (notes는 선택, 같은 날짜는 덮어씀)")
+    upload = st.file_uploader("파일 선택", type=["csv", "parquet"], key="daily_import_file")
+    if upload is not None and st.button("가져오기", key="daily_import_run"):
+        try:
+            with st.spinner("가져오는 중..."):
+                report = importer.import_logs(user_id, pet_id, upload, upload.name)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.success(f"{report.rows}행 중 {report.imported}행 저장")
+            if report.error_count:
+                st.warning(f"오류 {report.error_count}행은 건너뛰었습니다.")
+                st.dataframe(
+                    pd.DataFrame([(e.row, e.message) for e in report.errors], columns=["행", "오류"]),
+                    use_container_width=True, hide_index=True,
+                )
+
+#몸무게 꺾은선 그래프 (기간 선택, 긴 기간은 LTTB로 점 수를 줄여 그림)
+st.divider()
+st.subheader(" 📉 몸무게 변화")
+range_label = st.radio("기간", list(charts.RANGES), horizontal=True, key="weight_range")
+with telemetry.step("chart.spec"):
+    spec = charts.weight_chart_spec(user_id, pet_id, range_label, repo.generation(user_id), date.today())
+if spec:
+    st.vega_lite_chart(spec, use_container_width=True)
+else:
+    st.caption(f"{range_label} 동안의 몸무게 기록이 없습니다." if charts.RANGES[range_label] else "몸무게 기록이 없습니다.")
+
+
+
+#주간/월간 요약 (daily_rollups에서 구간당 1행만 읽음)
+st.divider()
+with st.expander("📊 주간 / 월간 요약"):
+    period_label = st.radio("구간", ["주간", "월간"], horizontal=True, key="rollup_period")
+    rollups = repo.list_rollups(user_id, pet_id, "week" if period_label == "주간" else "month")
+    if not rollups:
+        st.info("아직 저장된 기록이 없습니다.")
+    else:
+        df_roll = pd.DataFrame(
+            [(r.period_start, r.entries, r.weight_min, r.weight_avg, r.weight_max, r.food_g, r.water_ml, r.activity_min)
+             for r in reversed(rollups)],
+            columns=["시작일", "기록 수", "최저 몸무게", "평균 몸무게", "최고 몸무게", "총 사료량(g)", "총 음수량(ml)", "총 활동량(분)"],
+        )
+        st.dataframe(df_roll, use_container_width=True, hide_index=True)
+
+#적정 여부 분석 (전체 기록을 한 번에 판정, 펼쳤을 때만 계산)
+METRIC_LABELS = {"food_g": "사료량", "water_ml": "음수량", "activity_min": "활동량"}
+analysis = st.expander("✅ 적정 여부 분석 (전체 기록)", key="compliance_open", on_change="rerun")
+if analysis.open:
+    with analysis:
+        with telemetry.step("compliance.history"):
+            evaluated = compliance.history(user_id, pet_id, pet_species, pet_base_weight, repo.generation(user_id))
+        if evaluated.empty:
+            st.info("아직 저장된 기록이 없습니다.")
+        else:
+            streaks = compliance.current_streaks(evaluated)
+            for col, m in zip(st.columns(len(compliance.METRICS)), compliance.METRICS):
+                col.metric(f"{METRIC_LABELS[m]} 연속 적정", f"{streaks[m]}일")
+
+            window = st.radio("적정 비율 구간", [7, 30], format_func=lambda d: f"최근 {d}일", horizontal=True,
+                              key="compliance_window")
+            rates = compliance.rolling_ok_rate(evaluated, window).rename(columns=METRIC_LABELS)
+            st.line_chart(rates, y_label="적정 비율 (%)")
+
+            flags = evaluated[["log_date", *(f"flag_{m}" for m in compliance.METRICS)]].iloc[::-1]
+            flags.columns = ["날짜", *METRIC_LABELS.values()]
+            st.dataframe(flags, use_container_width=True, hide_index=True)
+
+#전체데이터보기 (펼쳤을 때만 조회, 보이는 페이지만 DB에서 읽음)
+st.divider()
+HISTORY_PAGE_SIZE = 30
+SORT_LABELS = {"날짜": "log_date", "몸무게": "weight", "사료량": "food_g", "음수량": "water_ml", "활동량": "activity_min"}
+
+def reset_history_page():
+    st.session_state["history_page"] = 0
+
+history = st.expander("📋 과거 기록 전체 보기", key="history_open", on_change="rerun")
+if history.open:
+    with history:
+        c1, c2, c3, c4 = st.columns([2, 1, 2, 2])
+        sort_label = c1.selectbox("정렬", list(SORT_LABELS), key="history_sort", on_change=reset_history_page)
+        descending = c2.radio("순서", ["내림", "오름"], key="history_order", on_change=reset_history_page) == "내림"
+        start = c3.date_input("시작일", value=None, key="history_start", on_change=reset_history_page)
+        end = c4.date_input("종료일", value=None, key="history_end", on_change=reset_history_page)
+
+        page = st.session_state.setdefault("history_page", 0)
+        logs, total = repo.list_daily_logs_page(
+            user_id, pet_id, page, HISTORY_PAGE_SIZE, SORT_LABELS[sort_label], descending,
+            start.isoformat() if start else None, end.isoformat() if end else None,
+        )
+        if not logs and page > 0:  #반려동물이 바뀌어 페이지 수가 줄어든 경우
+            reset_history_page()
+            st.rerun()
+        if total == 0:
+            st.info("아직 저장된 기록이 없습니다." if not (start or end) else "조건에 맞는 기록이 없습니다.")
+        else:
+            df_page = pd.DataFrame(
+                [(r.log_date, r.weight, r.food_g, r.water_ml, r.activity_min, r.notes) for r in logs],
+                columns=["날짜", "몸무게(kg)", "사료량(g)", "음수량(ml)", "활동량(분)", "메모"],
+            )
+            st.dataframe(df_page, use_container_width=True, hide_index=True)
+
+            pages = (total - 1) // HISTORY_PAGE_SIZE + 1
+            nav1, nav2, nav3 = st.columns([1, 2, 1])
+            if nav1.button("◀ 이전", disabled=page == 0, key="history_prev"):
+                st.session_state["history_page"] = page - 1
+                st.rerun()
+            nav2.caption(f"{page + 1} / {pages} 페이지 · 총 {total}건")
+            if nav3.button("다음 ▶", disabled=page + 1 >= pages, key="history_next"):
+                st.session_state["history_page"] = page + 1
+                st.rerun()
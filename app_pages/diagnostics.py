@@ -0,0 +1,71 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from core import session_cookie, telemetry
+from core.auth import is_admin, login_throttle_stats
+
+st.title("🛠️ 성능 진단")
+
+#관리자 확인 (PETCARE_ADMIN_EMAILS)
+SESSION_KEY = "auth_user"
+session_cookie.restore()
+user = st.session_state.get(SESSION_KEY)
+if not is_admin(user):
+    st.warning("관리자만 볼 수 있는 페이지입니다.")
+    st.stop()
+
+st.caption("이 서버 프로세스가 시작된 뒤 표본으로 기록된 rerun/SQL과 기준보다 느린 항목입니다. "
+           f"느린 기준: 페이지 {telemetry.SLOW_PAGE_MS:.0f}ms, SQL {telemetry.SLOW_QUERY_MS:.0f}ms")
+
+snap = telemetry.snapshot()
+c1, c2 = st.columns([3, 1])
+rate = c1.slider("표본 비율", 0.0, 1.0, float(snap["sample_rate"]), 0.01, key="trace_sample_rate")
+if rate != snap["sample_rate"]:
+    telemetry.set_sample_rate(rate)
+if c2.button("통계 초기화"):
+    telemetry.reset()
+    st.rerun()
+
+#느린 페이지 (rerun 시간, 모든 rerun 기준)
+st.subheader("페이지")
+if snap["pages"]:
+    st.dataframe(
+        pd.DataFrame(snap["pages"]).round(1).rename(columns={
+            "page": "페이지", "count": "rerun 수", "avg_ms": "평균 ms", "p95_ms": "p95 ms", "max_ms": "최대 ms"}),
+        use_container_width=True, hide_index=True,
+    )
+else:
+    st.info("아직 기록이 없습니다.")
+
+#SQL 문별 누적 (표본/느린 실행만)
+st.subheader("SQL")
+if snap["statements"]:
+    df = pd.DataFrame(snap["statements"])[["sql", "count", "total_ms", "avg_ms", "max_ms", "rows"]]
+    sort = st.radio("정렬", ["total_ms", "avg_ms", "max_ms", "count"], horizontal=True, key="trace_sql_sort")
+    st.dataframe(df.sort_values(sort, ascending=False).head(50).round(2),
+                 use_container_width=True, hide_index=True)
+else:
+    st.info("아직 기록이 없습니다.")
+
+#최근 rerun 구성 (SQL / 구간별 / 나머지 = Streamlit 요소, 파이썬 처리)
+st.subheader("최근 rerun")
+if snap["recent_spans"]:
+    rows = [{
+        "시각": datetime.fromtimestamp(s["started_at"]).strftime("%m-%d %H:%M:%S"),
+        "페이지": s["page"], "전체 ms": s["ms"], "SQL ms": s["sql_ms"], "SQL 수": s["queries"],
+        "구간": ", ".join(f"{k} {v:.0f}ms" for k, v in s["steps"].items()), "나머지 ms": s["other_ms"],
+        "오류": s["error"] or "",
+    } for s in snap["recent_spans"]]
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+else:
+    st.info("아직 기록이 없습니다.")
+
+if snap["slow_queries"]:
+    with st.expander(f"느린 SQL 최근 {len(snap['slow_queries'])}건"):
+        st.dataframe(pd.DataFrame(snap["slow_queries"]), use_container_width=True, hide_index=True)
+
+#로그인 시도 제한 (core.auth, 거절된 시도는 DB 조회/bcrypt 없이 반환)
+st.subheader("로그인 시도 제한")
+st.dataframe(pd.DataFrame(login_throttle_stats()).rename(columns={
+    "limiter": "기준", "keys": "추적 중인 키", "allowed": "허용", "shed": "거절", "evicted": "정리된 키"}),
+    use_container_width=True, hide_index=True)
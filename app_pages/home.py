@@ -0,0 +1,51 @@
+import streamlit as st
+from core.auth import is_admin
+from core.db import init_db
+from datetime import date, timedelta
+from core import anomaly, reconcile, repo, session_cookie
+
+init_db()  #db초기화 (스키마 마이그레이션은 프로세스당 1회, 이후 rerun에서는 바로 반환)
+reconcile.ensure_scheduled()  #사진 파일/DB 정리 작업 (PETCARE_RECONCILE_INTERVAL_S 설정 시)
+anomaly.ensure_scheduled()  #몸무게 급변 감지 작업 (PETCARE_ANOMALY_INTERVAL_S 설정 시)
+
+st.set_page_config(page_title="🐾 PetCare", layout="wide")
+
+
+#로그인 상태 확인 
+SESSION_KEY="auth_user"
+session_cookie.restore()  #새로고침/새 탭이면 로그인 유지 쿠키로 복원 (core.sessions)
+is_logged_in=SESSION_KEY in st.session_state
+user=st.session_state.get(SESSION_KEY)
+
+#메인홈페이지 제목 
+st.title("🐾 나만의 PetCare 홈")
+st.caption("좌측 Pages에서 기능을 선택하거나 아래 버튼으로 바로 이동하세요.")
+
+
+#로그인 상태에 따른 화면 표시
+if is_logged_in:
+    st.success(f"반갑습니다!")
+    if st.button("로그아웃"):
+        session_cookie.logout()
+        st.rerun()
+
+    #최근 30일 몸무게 급변 알림
+    alerts = repo.list_weight_alerts(user["id"], (date.today() - timedelta(days=30)).isoformat())
+    for a in alerts[:5]:
+        word = "감소" if a.kind == "loss" else "증가"
+        st.warning(f"⚖️ {a.pet_name}: {a.log_date} 몸무게 {a.weight:.1f}kg (최근 평균 {a.baseline:.1f}kg 대비 {abs(a.pct_change):.1f}% {word})")
+
+    st.subheader("내 반려동물 관리")
+    st.page_link("app_pages/myprofile.py", label="내 프로필 관리", icon="🐾")
+    st.page_link("app_pages/profile.py", label="반려동물 등록", icon="➕")
+    st.page_link("app_pages/daily.py",label="반려동물 일일 기록",icon="📆")
+    st.page_link("app_pages/calender.py",label="캘린더",icon="⏰")
+    st.page_link("app_pages/album.py", label="포토 앨범",icon="📷")
+    st.page_link("app_pages/search.py", label="기록 검색",icon="🔎")
+    if is_admin(user):
+        st.page_link("app_pages/diagnostics.py", label="성능 진단", icon="🛠️")
+else:
+    st.info("로그인이 필요합니다. 아래 버튼으로 로그인 또는 회원가입을 진행하세요.")
+    st.page_link("app_pages/login.py", label="로그인하기")
+    st.page_link("app_pages/signup.py", label="회원가입하기")
+
@@ -1,30 +1,24 @@
 from datetime import datetime, date
 import streamlit as st
-from sqlalchemy import text
-from core.db import engine
+from dataclasses import asdict
+from pathlib import Path
+from core import export, media_server, repo, session_cookie
 
 st.title("🐾 내 프로필 관리")
 
 #로그인 확인
 SESSION_KEY = "auth_user"
+session_cookie.restore()
 user = st.session_state.get(SESSION_KEY)
 if not user:
     st.warning("로그인이 필요합니다.")
-    st.page_link("pages/login.py",label="로그인 페이지로 이동")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
     st.stop()
 user_id = user["id"] 
 
 #반려동물 목록 가져오기(pets 테이블)
 def get_pets_by_user(user_id: int) -> list[dict]:
-    q = text("""
-        SELECT id, name, species, breed, birth, notes
-        FROM pets
-        WHERE user_id = :uid
-        ORDER BY id
-    """)
-    with engine.connect() as conn:
-        rows = conn.execute(q, {"uid": user_id}).mappings().all()
-        return [dict(r) for r in rows]
+    return [asdict(p) for p in repo.list_pets(user_id)]
 
 #날짜 표시 포맷
 def fmt_date(d) -> str:
@@ -54,14 +48,7 @@ def species_icon(sp: str) -> str:
 def delete_pet(pet_id: int, user_id: int) -> bool:
     """현재 로그인 사용자의 소유 펫만 삭제"""
     try:
-        with engine.begin() as conn:
-            # 안전: FK on
-            conn.execute(text("PRAGMA foreign_keys=ON"))
-            res = conn.execute(
-                text("DELETE FROM pets WHERE id = :pid AND user_id = :uid"),
-                {"pid": pet_id, "uid": user_id},
-            )
-        return res.rowcount > 0
+        return repo.delete_pet(user_id, pet_id)
     except Exception as e:
         st.error(f"삭제 중 오류가 발생했습니다: {e}")
         return False
@@ -71,7 +58,7 @@ pets = get_pets_by_user(user_id)
 
 if not pets:
     st.info("등록된 반려동물이 없습니다.")
-    st.page_link("pages/profile.py", label="➕ 반려동물 프로필 추가 등록")
+    st.page_link("app_pages/profile.py", label="➕ 반려동물 프로필 추가 등록")
     st.stop()
 
 #여러 마리면 탭으로 구분
@@ -121,4 +108,33 @@ for p, tab in zip(pets, tabs):
     
 
 st.divider()
-st.page_link("pages/profile.py", label="➕ 반려동물 프로필 추가 등록")
+st.page_link("app_pages/profile.py", label="➕ 반려동물 프로필 추가 등록")
+
+#계정 전체 내보내기 (누른 시점에 만들고, 데이터가 바뀌기 전까지는 만든 파일을 그대로 사용)
+st.divider()
+st.subheader("📦 내 기록 전체 내보내기")
+st.caption("반려동물, 일일 기록, 일정, 사진 정보(CSV/JSON Lines)와 원본 사진/영상을 zip 파일 하나로 받습니다.")
+#미디어 서버가 있으면 서명된 링크로 디스크에서 바로 전송 (Streamlit 메모리를 거치지 않음)
+#없으면 만들어 둔 zip 파일을 download_button으로 전달
+if st.button("zip 파일 만들기"):
+    with st.spinner("내보내기 파일을 준비하는 중..."):
+        export_file = export.export_path(user_id)
+    if media_server.enabled():
+        media_server.ensure_started()
+        st.session_state[f"export_url_{user_id}"] = media_server.export_url(export_file)
+    else:
+        st.session_state[f"export_file_{user_id}"] = str(export_file)
+export_url = st.session_state.get(f"export_url_{user_id}")
+export_file = st.session_state.get(f"export_file_{user_id}")
+if export_url:
+    st.link_button("zip 파일 받기", export_url)
+    st.caption(f"링크는 {media_server.EXPORT_LINK_TTL_S // 60}분 동안 유효합니다.")
+elif export_file and Path(export_file).exists():  #그 뒤 데이터가 바뀌면 이전 zip은 지워짐
+    with open(export_file, "rb") as f:
+        st.download_button(
+            "zip 파일 받기",
+            data=f,
+            file_name=f"petcare-export-{date.today().isoformat()}.zip",
+            mime="application/zip",
+            on_click="ignore",
+        )
@@ -1,16 +1,16 @@
 import streamlit as st
-from sqlalchemy import text
-from core.db import engine
+from core import repo, session_cookie
 import datetime as dt
 
 st.title("🐾 반려동물 프로필 등록")
 
 #로그인 확인
 SESSION_KEY = "auth_user"
+session_cookie.restore()
 user = st.session_state.get(SESSION_KEY)
 if not user:
     st.warning("로그인이 필요합니다.")
-    st.page_link("pages/login.py",label="로그인 페이지로 이동")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
     st.stop()
 user_id = user["id"] 
 
@@ -31,22 +31,16 @@ if submitted:
     if name is None:
         st.warning("이름은 필수 입력 항목입니다. 모두 입력해주세요.")
     else:
-        with engine.begin() as conn:
-            conn.execute(
-                text("""
-                    INSERT INTO pets(user_id, name, species, breed, birth, notes)
-                    VALUES (:user_id, :name, :species, :breed, :birth, :notes)
-                """),
-                {
-                    "user_id": int(user["id"]),
-                    "name": f"{name}",  
-                    "species": species,
-                    "breed": breed if breed else None,
-                    "birth": str(birth),
-                    "notes": notes if notes else None
-                })
+        repo.add_pet(
+            int(user["id"]),
+            name=f"{name}",
+            species=species,
+            breed=breed if breed else None,
+            birth=str(birth),
+            notes=notes if notes else None,
+        )
         st.success(f"🐾 프로필 등록이 완료되었습니다 🐾")
-        st.page_link("pages/myprofile.py", label="내 프로필로 이동")
+        st.page_link("app_pages/myprofile.py", label="내 프로필로 이동")
         
    
 
@@ -0,0 +1,36 @@
+import streamlit as st
+import html
+from core import repo, search, session_cookie, telemetry
+
+st.title("🔎 기록 검색")
+st.caption("일일 기록 메모, 반려동물 메모, 일정 제목, 사진 설명에서 찾아요. 띄어쓰기로 여러 단어를 입력하면 모두 포함된 항목만 보여줘요.")
+
+#로그인 확인
+SESSION_KEY = "auth_user"
+session_cookie.restore()
+user = st.session_state.get(SESSION_KEY)
+if not user:
+    st.warning("로그인이 필요합니다.")
+    st.page_link("app_pages/login.py",label="로그인 페이지로 이동")
+    st.stop()
+user_id = user["id"]
+
+KIND_LABELS = {"daily": "📆 일일 기록", "pet": "🐾 반려동물 메모", "event": "⏰ 일정", "photo": "📷 사진"}
+
+#검색어 강조 표시를 <mark>로 (본문은 이스케이프, 마크다운으로 해석되지 않도록 st.html로 표시)
+def render_snippet(snippet: str) -> str:
+    return (html.escape(snippet)
+            .replace(search.HL_OPEN, "<mark>").replace(search.HL_CLOSE, "</mark>")
+            .replace("\n", " "))
+
+query = st.text_input("검색어", placeholder="예: 병원 다리, 절뚝", key="search_query")
+if query.strip():
+    with telemetry.step("search.query"):
+        hits = repo.search_records(user_id, query)
+    if not hits:
+        st.info("검색 결과가 없습니다.")
+    else:
+        st.caption(f"{len(hits)}건" + (" (상위 50건)" if len(hits) >= 50 else ""))
+        for h in hits:
+            meta = " · ".join(x for x in (KIND_LABELS.get(h.kind, h.kind), h.pet_name, h.doc_date) if x)
+            st.html(f"<div><strong>{html.escape(meta)}</strong><br>{render_snippet(h.snippet)}</div>")
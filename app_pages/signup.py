@@ -21,5 +21,5 @@ if submitted:
         st.error(message)
     else:
         st.success("회원가입이 완료되었습니다. 이제 로그인해 주세요.")
-        st.page_link("pages/login.py", label="로그인 하러가기")
+        st.page_link("app_pages/login.py", label="로그인 하러가기")
         st.balloons()
@@ -0,0 +1,58 @@
+"""회원가입/로그인 동시 요청 벤치마크
+
+임시 DB에 사용자를 만든 뒤 여러 스레드(= Streamlit 세션)에서 동시에 로그인을 보내
+초당 처리량과 지연시간을 측정 (bcrypt는 core.passwords의 프로세스 풀에서 실행)
+
+실행: python -m bench.auth_burst --users 50 --logins 200 --concurrency 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    ok = fn(*args)[0]
+    return ok, time.perf_counter() - t0
+
+def _report(name: str, results: list, elapsed: float):
+    lat = sorted(r[1] for r in results)
+    ok = sum(1 for r in results if r[0])
+    p95 = lat[int(len(lat) * 0.95) - 1] if lat else 0.0
+    print(f"{name:<8} n={len(results):<5} ok={ok:<5} {len(results) / elapsed:8.1f} req/s  "
+          f"p50={statistics.median(lat) * 1000:7.0f}ms  p95={p95 * 1000:7.0f}ms")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--logins", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        #core 모듈을 불러오기 전에 임시 DB로 전환
+        os.environ["PETCARE_DB_PATH"] = str(Path(tmp) / "bench.db")
+        from core.db import init_db
+        from core.auth import create_user, verify_login
+        from core import passwords
+        init_db()
+        print(f"bcrypt rounds={passwords.BCRYPT_ROUNDS} workers={passwords.HASH_WORKERS}")
+
+        passwords.hash_password("warmup1234")  #워커 프로세스 기동 시간 제외
+        emails = [f"user{i}@example.com" for i in range(args.users)]
+        with ThreadPoolExecutor(args.concurrency) as ex:
+            t0 = time.perf_counter()
+            results = list(ex.map(lambda e: _timed(create_user, e, "password123"), emails))
+            _report("signup", results, time.perf_counter() - t0)
+
+            logins = [emails[i % len(emails)] for i in range(args.logins)]
+            t0 = time.perf_counter()
+            results = list(ex.map(lambda e: _timed(verify_login, e, "password123"), logins))
+            _report("login", results, time.perf_counter() - t0)
+        passwords.shutdown()
+
+if __name__ == "__main__":
+    main()
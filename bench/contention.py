@@ -0,0 +1,88 @@
+"""동시 쓰기 경합 벤치마크
+
+N개의 스레드가 동시에 daily_logs에 기록을 쓰면서 처리량과 잠금 오류 수를 측정
+아무 설정 없는 create_engine(rollback journal, pysqlite 기본 잠금 대기)과 core.db의 연결 프로필을 비교
+
+실행: python -m bench.contention --writers 1 2 4 8 16 --ops 200
+"""
+import argparse
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from core.db import ConnectionProfile, make_engine, write_tx
+from core.migrations import migrate
+
+PROFILES = {
+    "baseline": None,  #SQLAlchemy/SQLite 기본값 그대로
+    "tuned": ConnectionProfile(),
+}
+
+def _setup(path: Path, profile: ConnectionProfile | None, writers: int):
+    eng = make_engine(path, profile) if profile else create_engine(f"sqlite:///{path}")
+    migrate(eng)
+    with write_tx(eng) as conn:
+        conn.execute(text("INSERT INTO users(email, password_hash) VALUES ('bench@example.com', x'00')"))
+        uid = conn.execute(text("SELECT id FROM users")).scalar()
+        for i in range(writers):
+            conn.execute(text("INSERT INTO pets(user_id, name, species, birth) VALUES (:u, :n, 'dog', '2020-01-01')"),
+                         {"u": uid, "n": f"pet{i}"})
+        pet_ids = [r[0] for r in conn.execute(text("SELECT id FROM pets ORDER BY id"))]
+    return eng, uid, pet_ids
+
+def run(profile_name: str, writers: int, ops: int) -> dict:
+    profile = PROFILES[profile_name]
+    with tempfile.TemporaryDirectory() as tmp:
+        eng, uid, pet_ids = _setup(Path(tmp) / "bench.db", profile, writers)
+        errors = [0] * writers
+        start = threading.Barrier(writers + 1)
+
+        def worker(i: int):
+            start.wait()
+            d0 = date(2000, 1, 1)
+            for k in range(ops):
+                try:
+                    with write_tx(eng) as conn:
+                        conn.execute(text("""
+                            INSERT INTO daily_logs (user_id, pet_id, log_date, weight, food_g)
+                            VALUES (:u, :p, :d, 5.0, 100)
+                            ON CONFLICT(pet_id, log_date) DO UPDATE SET weight=excluded.weight
+                        """), {"u": uid, "p": pet_ids[i], "d": (d0 + timedelta(days=k)).isoformat()})
+                        #동시에 읽는 페이지를 흉내내는 조회
+                        conn.execute(text("SELECT count(*) FROM daily_logs WHERE pet_id=:p"), {"p": pet_ids[i]})
+                except OperationalError:
+                    errors[i] += 1
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(writers)]
+        for t in threads:
+            t.start()
+        start.wait()
+        t0 = time.perf_counter()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+        eng.dispose()
+
+    total = writers * ops
+    failed = sum(errors)
+    return {"profile": profile_name, "writers": writers, "ok": total - failed, "locked": failed,
+            "seconds": elapsed, "tx_per_s": (total - failed) / elapsed}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    ap.add_argument("--ops", type=int, default=200, help="writer당 트랜잭션 수")
+    ap.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = ap.parse_args()
+
+    print(f"{'profile':<10}{'writers':>8}{'ok':>8}{'locked':>8}{'sec':>9}{'tx/s':>10}")
+    for name in args.profiles:
+        for n in args.writers:
+            r = run(name, n, args.ops)
+            print(f"{r['profile']:<10}{r['writers']:>8}{r['ok']:>8}{r['locked']:>8}{r['seconds']:>9.2f}{r['tx_per_s']:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""페이지 벤치마크 (Streamlit AppTest로 app_pages/*.py를 브라우저 없이 실행)
+
+데이터 크기(사용자 수)마다 임시 DB를 bench.seed로 만들고, 별도 프로세스에서 페이지별로
+- 캐시를 비운 첫 실행(cold)의 지연시간, SQL 실행 수, 파이썬 메모리 최대 사용량(tracemalloc)
+- 같은 세션에서 다시 실행(rerun)한 지연시간 p50/p95와 SQL 실행 수
+를 측정해 JSON으로 저장. --baseline으로 이전 결과 파일을 주면 p50 변화율을 함께 출력
+
+실행: python -m bench.pages --sizes 1 10 50 --years 3 --runs 5 --out bench_pages.json [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+NO_LOGIN_PAGES = {"app_pages/login.py", "app_pages/signup.py"}
+
+def page_scripts() -> list[str]:
+    #home.py는 페이지를 고르는 라우터이므로 페이지 스크립트를 직접 실행 (홈 먼저)
+    pages = sorted(p.relative_to(ROOT).as_posix() for p in (ROOT / "app_pages").glob("*.py"))
+    return ["app_pages/home.py"] + [p for p in pages if p != "app_pages/home.py"]
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+def _measure(script: str, user: dict, runs: int, counter: list[int]) -> dict:
+    from streamlit.testing.v1 import AppTest
+    from core import repo
+
+    def fresh():
+        at = AppTest.from_file(str(ROOT / script), default_timeout=120)
+        if script not in NO_LOGIN_PAGES:
+            at.session_state["auth_user"] = user
+        return at
+
+    def timed(at) -> tuple[float, int]:
+        counter[0] = 0
+        t0 = time.perf_counter()
+        at.run()
+        return (time.perf_counter() - t0) * 1000, counter[0]
+
+    #cold: 사용자 캐시(세대 번호)를 비운 뒤 새 세션으로 실행
+    repo.bump_generation(user["id"])
+    at = fresh()
+    cold_ms, cold_queries = timed(at)
+    errors = [e.message for e in at.exception]
+
+    #메모리는 tracemalloc 부담이 지연시간에 섞이지 않도록 따로 한 번 더 실행
+    repo.bump_generation(user["id"])
+    tracemalloc.start()
+    fresh().run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    warm = [timed(at) for _ in range(runs)]
+    lat = [w[0] for w in warm]
+    return {
+        "page": script,
+        "cold_ms": round(cold_ms, 1),
+        "cold_queries": cold_queries,
+        "peak_kib": round(peak / 1024),
+        "rerun_p50_ms": round(statistics.median(lat), 1),
+        "rerun_p95_ms": round(_pct(lat, 0.95), 1),
+        "rerun_queries": round(statistics.mean(w[1] for w in warm), 1),
+        "error": errors[0] if errors else None,
+    }
+
+def _db_bytes(path: Path) -> int:
+    """DB 파일 크기 (WAL 모드라 체크포인트 전 내용은 -wal 파일에 있음)"""
+    return sum(p.stat().st_size for p in (path, path.with_name(path.name + "-wal")) if p.exists())
+
+def worker(args) -> dict:
+    """한 가지 데이터 크기 측정 (환경 변수로 DB/assets를 바꾼 별도 프로세스에서 실행)"""
+    from bench.seed import seed
+    counts = seed(args.users, args.years, args.photos, seed=args.seed)
+    from sqlalchemy import event
+    from core.db import engine
+    counter = [0]
+    event.listen(engine, "before_cursor_execute", lambda *a: counter.__setitem__(0, counter[0] + 1))
+    user = {"id": 1, "email": "user0@example.com"}
+    results = [_measure(p, user, args.runs, counter) for p in page_scripts()]
+    return {
+        "users": args.users,
+        "data": counts,
+        "db_mib": round(_db_bytes(Path(os.environ["PETCARE_DB_PATH"])) / 2**20, 1),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "pages": results,
+    }
+
+def _run_size(users: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   PETCARE_DB_PATH=str(Path(tmp) / "bench.db"),
+                   PETCARE_ASSETS_DIR=str(Path(tmp) / "assets"))
+        cmd = [sys.executable, "-m", "bench.pages", "--worker", "--users", str(users), "--years", str(args.years),
+               "--photos", str(args.photos), "--runs", str(args.runs), "--seed", str(args.seed)]
+        out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise RuntimeError(f"size={users} failed:\n{out.stderr[-2000:]}")
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def _print(size: dict, baseline: dict | None) -> None:
+    print(f"\n== users={size['users']} logs={size['data']['daily_logs']} photos={size['data']['photos']} "
+          f"db={size['db_mib']}MiB rss={size['max_rss_mib']}MiB")
+    print(f"{'page':<22}{'cold ms':>9}{'q':>5}{'rerun p50':>11}{'p95':>8}{'q':>6}{'peak KiB':>10}  vs baseline")
+    for r in size["pages"]:
+        delta = ""
+        old = (baseline or {}).get((size["users"], r["page"]))
+        if old and old["rerun_p50_ms"]:
+            delta = f"{(r['rerun_p50_ms'] / old['rerun_p50_ms'] - 1) * 100:+.0f}%"
+        print(f"{r['page']:<22}{r['cold_ms']:>9.0f}{r['cold_queries']:>5}{r['rerun_p50_ms']:>11.1f}"
+              f"{r['rerun_p95_ms']:>8.1f}{r['rerun_queries']:>6}{r['peak_kib']:>10}  {delta}"
+              + (f"  (error: {r['error'][:60]})" if r["error"] else ""))
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50], help="사용자 수")
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--photos", type=int, default=10, help="사용자당 사진 수")
+    ap.add_argument("--runs", type=int, default=5, help="페이지별 rerun 횟수")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="bench_pages.json")
+    ap.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--users", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args), ensure_ascii=False))
+        return
+
+    baseline = None
+    if args.baseline:
+        old = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        baseline = {(s["users"], r["page"]): r for s in old["sizes"] for r in s["pages"]}
+
+    import streamlit
+    result = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "params": {"years": args.years, "photos": args.photos, "runs": args.runs, "seed": args.seed},
+        },
+        "sizes": [],
+    }
+    for users in args.sizes:
+        size = _run_size(users, args)
+        result["sizes"].append(size)
+        _print(size, baseline)
+    Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nsaved {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""여러 프로세스 배포 부하 테스트 (PETCARE_MULTI_PROCESS=1로 같은 SQLite 파일 공유)
+
+bench.seed로 만든 임시 DB 하나에 프로세스(= streamlit run 하나) R개를 띄워
+각 프로세스의 스레드(= 브라우저 세션)들이 정해진 시간 동안 페이지 조회(반려동물, 기록 표, 월간 일정)와
+일일 기록 저장을 섞어 실행. 프로세스 수별 전체 처리량, 지연시간 p50/p95, 잠금 재시도/실패 수를 출력
+
+실행: python -m bench.replicas --replicas 1 2 4 --threads 4 --seconds 10 --write-ratio 0.1 [--out replicas.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0.0
+
+def worker(args) -> dict:
+    """프로세스 하나 (args.start 시각에 맞춰 시작, args.seconds 동안 실행)"""
+    from sqlalchemy.exc import OperationalError
+    from core import db, repo
+    today = date.today()
+    pets = {uid: [p.id for p in repo.list_pets(uid)] for uid in range(1, args.users + 1)}
+    pets = {uid: ids for uid, ids in pets.items() if ids}
+    stats = {"reads": 0, "writes": 0, "errors": 0}
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def session(i: int):
+        rng = random.Random(args.seed * 1000 + i)
+        uid = rng.choice(list(pets))
+        local = {"reads": 0, "writes": 0, "errors": 0}
+        lat = []
+        while time.time() < args.start:
+            time.sleep(0.001)
+        end = args.start + args.seconds
+        while time.time() < end:
+            pet_id = rng.choice(pets[uid])
+            t0 = time.perf_counter()
+            try:
+                if rng.random() < args.write_ratio:
+                    d = today - timedelta(days=rng.randrange(30))
+                    repo.upsert_daily_log(uid, pet_id, d.isoformat(), round(rng.uniform(3, 30), 2),
+                                          100.0, 200.0, 30.0, None)
+                    local["writes"] += 1
+                else:
+                    repo.list_pets(uid)
+                    repo.list_daily_logs_page(uid, pet_id, rng.randrange(3), 20)
+                    repo.list_events_in_month(uid, today.year, today.month)
+                    local["reads"] += 1
+            except OperationalError:
+                local["errors"] += 1
+            lat.append((time.perf_counter() - t0) * 1000)
+            if rng.random() < 0.05:  #가끔 다른 사용자로 (다른 세션)
+                uid = rng.choice(list(pets))
+        with lock:
+            for k, v in local.items():
+                stats[k] += v
+            latencies.extend(lat)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {**stats, "latencies": latencies, **db.write_stats}
+
+def _run(replicas: int, db_path: Path, args) -> dict:
+    env = dict(os.environ, PETCARE_MULTI_PROCESS="1", PETCARE_DB_PATH=str(db_path),
+               PETCARE_ASSETS_DIR=str(db_path.parent / "assets"), PETCARE_TRACE_SAMPLE="0")
+    start = time.time() + 3  #프로세스 기동/모듈 import 시간 제외
+    cmd = [sys.executable, "-m", "bench.replicas", "--worker", "--start", str(start),
+           "--seconds", str(args.seconds), "--threads", str(args.threads), "--users", str(args.users),
+           "--write-ratio", str(args.write_ratio)]
+    procs = [subprocess.Popen(cmd + ["--seed", str(r)], cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, text=True) for r in range(replicas)]
+    results = []
+    for p in procs:
+        out, err = p.communicate()
+        if p.returncode != 0:
+            raise RuntimeError(f"replica failed:\n{err[-2000:]}")
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    lat = [x for r in results for x in r["latencies"]]
+    ops = sum(r["reads"] + r["writes"] for r in results)
+    return {
+        "replicas": replicas,
+        "ops": ops,
+        "ops_per_s": round(ops / args.seconds, 1),
+        "reads": sum(r["reads"] for r in results),
+        "writes": sum(r["writes"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+        "busy_retries": sum(r["busy_retries"] for r in results),
+        "busy_failures": sum(r["busy_failures"] for r in results),
+        "p50_ms": round(statistics.median(lat), 2) if lat else None,
+        "p95_ms": round(_pct(lat, 0.95), 2),
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4], help="프로세스 수")
+    ap.add_argument("--threads", type=int, default=4, help="프로세스당 동시 세션 수")
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--write-ratio", type=float, default=0.1)
+    ap.add_argument("--users", type=int, default=20)
+    ap.add_argument("--years", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="결과 JSON 저장 경로")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--start", type=float, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args)))
+        return
+
+    print(f"cpus={os.cpu_count()} threads/replica={args.threads} write_ratio={args.write_ratio} seconds={args.seconds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        subprocess.run([sys.executable, "-m", "bench.seed", "--db", str(db_path), "--users", str(args.users),
+                        "--years", str(args.years), "--photos", "0", "--seed", str(args.seed)],
+                       cwd=ROOT, check=True, capture_output=True)
+        rows = []
+        print(f"{'replicas':>8}{'ops/s':>10}{'scale':>7}{'p50 ms':>9}{'p95 ms':>9}{'writes':>8}{'retries':>9}{'failed':>8}")
+        for r in args.replicas:
+            row = _run(r, db_path, args)
+            rows.append(row)
+            scale = row["ops_per_s"] / rows[0]["ops_per_s"] if rows[0]["ops_per_s"] else 0
+            print(f"{r:>8}{row['ops_per_s']:>10.0f}{scale:>6.2f}x{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+                  f"{row['writes']:>8}{row['busy_retries']:>9}{row['busy_failures'] + row['errors']:>8}")
+    if args.out:
+        Path(args.out).write_text(json.dumps({"params": vars(args), "results": rows}, indent=2), encoding="utf-8")
+        print(f"saved {args.out}")
+
+if __name__ == "__main__":
+    main()
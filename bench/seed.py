@@ -0,0 +1,129 @@
+"""대용량 테스트 데이터 생성
+
+사용자 N명에 반려동물 1~3마리씩, 몇 년 치 daily_logs(몸무게 랜덤 워크, 종별 목표량 주변 값),
+단일/반복 일정, 사진 파일(축소본 포함)을 만들어 지정한 DB와 assets 폴더에 채움
+같은 --seed면 같은 데이터가 만들어짐 (로그인 비밀번호는 모두 password123)
+
+실행: python -m bench.seed --db /tmp/big.db --assets /tmp/big-assets --users 100 --years 5 --photos 20
+"""
+import argparse
+import io
+import os
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+DOG_BREEDS = ["말티즈", "푸들", "포메라니안", "시츄", "진돗개", "골든 리트리버", "비숑", "웰시코기"]
+CAT_BREEDS = ["코숏", "러시안 블루", "페르시안", "스코티시 폴드", "브리티시 숏헤어", "먼치킨"]
+NAMES = ["초코", "콩이", "보리", "두부", "마루", "코코", "호두", "별이", "뭉치", "나비", "치즈", "몽이"]
+NOTES = ["산책 많이 함", "간식 조금", "병원 다녀옴", "밥을 남김", "컨디션 좋음", "목욕함"]
+EVENTS = ["병원 예약", "미용", "사료 주문", "예방접종", "친구네 방문", "발톱 정리"]
+SERIES = [("심장사상충 약", "monthly"), ("산책 모임", "weekly"), ("구충제", "monthly"), ("종합 검진", "yearly")]
+
+def _pet_logs(rng: random.Random, species: str, start: date, days: int) -> tuple[list[tuple], float]:
+    """(log_date, weight, food_g, water_ml, activity_min, notes) 목록과 마지막 몸무게 (약 10% 날짜는 비움)"""
+    from core import compliance
+    w = rng.uniform(2.5, 6.0) if species == "cat" else rng.uniform(3.0, 30.0)
+    t = compliance.targets(species, w).iloc[0]
+    rows = []
+    for k in range(days):
+        w = max(w * (1 + rng.gauss(0, 0.004)), 0.5)
+        if rng.random() < 0.1:
+            continue
+        rows.append((
+            (start + timedelta(days=k)).isoformat(),
+            round(w, 2),
+            round(t["food_g"] * rng.uniform(0.6, 1.4), 1),
+            round(t["water_ml"] * rng.uniform(0.6, 1.4), 1),
+            round(t["activity_min"] * rng.uniform(0.5, 1.5)),
+            rng.choice(NOTES) if rng.random() < 0.05 else None,
+        ))
+    return rows, w
+
+def _photo_bytes(rng: random.Random, size: tuple[int, int]) -> bytes:
+    from PIL import Image, ImageDraw
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        draw.ellipse((x, y, x + rng.randrange(40, 400), y + rng.randrange(40, 400)),
+                     fill=tuple(rng.randrange(256) for _ in range(3)))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+def seed(users: int, years: int, photos: int, events_per_month: int = 2, seed: int = 0) -> dict:
+    """환경 변수로 지정한 DB/assets에 데이터 생성 (core 모듈은 여기서 처음 불러옴)"""
+    from sqlalchemy import text
+    from core import media, passwords, repo, storage
+    from core.db import init_db, write_tx
+    init_db()
+    rng = random.Random(seed)
+    today = date.today()
+    start = today - timedelta(days=365 * years)
+    password_hash = passwords._hash(b"password123", 4)  #로그인 확인용 (작업 강도는 낮게, 로그인 시 재해시됨)
+    counts = {"users": 0, "pets": 0, "daily_logs": 0, "events": 0, "series": 0, "photos": 0}
+    t0 = time.perf_counter()
+
+    for i in range(users):
+        with write_tx() as conn:
+            conn.execute(text("INSERT INTO users (email, password_hash) VALUES (:e, :h)"),
+                         {"e": f"user{i}@example.com", "h": password_hash})
+            uid = conn.execute(text("SELECT id FROM users WHERE email = :e"), {"e": f"user{i}@example.com"}).scalar()
+            for name in rng.sample(NAMES, rng.randint(1, 3)):
+                species = rng.choice(["dog", "cat"])
+                breed = rng.choice(DOG_BREEDS if species == "dog" else CAT_BREEDS)
+                birth = start - timedelta(days=rng.randrange(30, 3000))
+                conn.execute(text("""
+                    INSERT INTO pets (user_id, name, species, breed, birth, notes)
+                    VALUES (:u, :n, :s, :b, :d, :notes)
+                """), {"u": uid, "n": name, "s": species, "b": breed, "d": birth.isoformat(),
+                       "notes": rng.choice(NOTES) if rng.random() < 0.3 else None})
+            for m in range(years * 12 * events_per_month):
+                d = start + timedelta(days=rng.randrange((today - start).days + 60))
+                conn.execute(text("INSERT INTO events (user_id, event_date, title) VALUES (:u, :d, :t)"),
+                             {"u": uid, "d": d.isoformat(), "t": rng.choice(EVENTS)})
+                counts["events"] += 1
+        counts["users"] += 1
+
+        for pet in repo.list_pets(uid):
+            rows, last_weight = _pet_logs(rng, pet.species, start, (today - start).days + 1)
+            counts["daily_logs"] += repo.upsert_daily_logs(uid, pet.id, rows)
+            with write_tx() as conn:
+                conn.execute(text("UPDATE pets SET weight = :w WHERE id = :id"), {"w": round(last_weight, 2), "id": pet.id})
+            counts["pets"] += 1
+
+        for title, freq in rng.sample(SERIES, rng.randint(0, 2)):
+            repo.add_event_series(uid, title, (start + timedelta(days=rng.randrange(365))).isoformat(), freq)
+            counts["series"] += 1
+
+        files = []
+        for _ in range(photos):
+            staged = storage.stage(io.BytesIO(_photo_bytes(rng, rng.choice([(1600, 1200), (1200, 1600), (2400, 1800)]))), ".jpg")
+            files.append((staged, media.rendition_columns(media.make_renditions(staged.tmp_path, stem=staged.sha256))))
+        if files:
+            repo.add_photos(uid, files, rng.choice(NOTES))
+            counts["photos"] += len(files)
+
+    counts["seconds"] = round(time.perf_counter() - t0, 2)
+    return counts
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", required=True, help="만들 DB 파일 (data/petcare.db를 덮어쓰지 않도록 별도 경로 지정)")
+    ap.add_argument("--assets", help="사진 저장 폴더 (기본: DB 파일 옆 assets/)")
+    ap.add_argument("--users", type=int, default=10)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--photos", type=int, default=10, help="사용자당 사진 수")
+    ap.add_argument("--events-per-month", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    #core 모듈을 불러오기 전에 경로 지정
+    os.environ["PETCARE_DB_PATH"] = str(Path(args.db).resolve())
+    os.environ["PETCARE_ASSETS_DIR"] = str(Path(args.assets or Path(args.db).resolve().parent / "assets").resolve())
+    print(seed(args.users, args.years, args.photos, args.events_per_month, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+from core.db import read_engine, write_tx
+
+#몸무게 급변 감지 배치 작업 (모든 반려동물)
+#반려동물별로 직전 WINDOW_DAYS일 평균/표준편차를 기준선으로 두고 변화율 또는 z-score가 기준을 넘는 날을 weight_alerts에 저장
+#마지막 실행 이후 daily_logs가 바뀐 반려동물만 CHUNK_PETS마리씩 읽어 다시 계산 (결과는 반려동물 단위로 교체)
+#  바뀐 반려동물 = updated_at이 워터마크 이후인 기록 + 삭제 트리거가 daily_log_deletes에 남긴 반려동물
+#  (daily_log_deletes는 반려동물당 한 행, seq가 읽은 시점의 최댓값 이하인 행만 비움)
+#청크가 여러 개면 계산은 프로세스 풀에서 병렬로, DB 읽기/쓰기는 이 프로세스에서
+JOB = "weight_anomaly"
+WINDOW_DAYS = 14
+MIN_POINTS = 3        #기준선에 필요한 최소 기록 수
+PCT_THRESHOLD = 5.0   #기준선 대비 변화율(%)
+Z_THRESHOLD = 3.0
+Z_MIN_PCT = 2.0       #z-score만으로 알릴 때도 최소한 이 정도는 변해야 함
+MIN_STD_RATIO = 0.01  #체중계 값이 거의 같을 때 z-score가 튀지 않도록 표준편차 하한 (기준선의 1%)
+CHUNK_PETS = 200
+WORKERS = int(os.environ.get("PETCARE_ANOMALY_WORKERS", "0")) or min(os.cpu_count() or 1, 4)
+
+@dataclass
+class AnomalyReport:
+    full: bool = False
+    pets: int = 0
+    rows: int = 0
+    chunks: int = 0
+    alerts: int = 0
+    watermark: str | None = None
+    deleted_upto: int = 0  #처리한 daily_log_deletes의 마지막 seq
+    seconds: float = 0.0
+
+
+#워커 프로세스에서도 실행되는 계산 (DB 접근 없음)
+def detect(df: pd.DataFrame) -> pd.DataFrame:
+    """pet_id, user_id, log_date, weight 컬럼(반려동물/날짜 순 정렬)에서 알림 행만 반환"""
+    if df.empty:
+        return df.assign(kind=[], baseline=[], pct_change=[], zscore=[])
+    df = df.assign(log_date=pd.to_datetime(df["log_date"]))
+    #직전 WINDOW_DAYS일(당일 제외) 기준선
+    roll = (df.groupby("pet_id", sort=False)
+              .rolling(f"{WINDOW_DAYS}D", on="log_date", closed="left")["weight"])
+    baseline = roll.mean().to_numpy()
+    std = roll.std().to_numpy()
+    count = roll.count().to_numpy()
+
+    w = df["weight"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = (w - baseline) / baseline * 100
+        z = (w - baseline) / np.fmax(np.nan_to_num(std), baseline * MIN_STD_RATIO)
+    ready = count >= MIN_POINTS
+    hit = ready & ((np.abs(pct) >= PCT_THRESHOLD) | ((np.abs(z) >= Z_THRESHOLD) & (np.abs(pct) >= Z_MIN_PCT)))
+
+    out = df.loc[hit, ["pet_id", "user_id", "log_date", "weight"]].copy()
+    out["kind"] = np.where(pct[hit] < 0, "loss", "gain")
+    out["baseline"] = baseline[hit]
+    out["pct_change"] = pct[hit]
+    out["zscore"] = z[hit]
+    out["log_date"] = out["log_date"].dt.strftime("%Y-%m-%d")
+    return out
+
+
+def _changed_pets(full: bool) -> tuple[list[int], str | None, int]:
+    """다시 계산할 반려동물, 이번 실행의 새 워터마크 (daily_logs.updated_at 최댓값), 읽은 삭제 기록의 마지막 seq"""
+    with read_engine.connect() as conn:
+        new_mark = conn.execute(text("SELECT max(updated_at) FROM daily_logs")).scalar()
+        deleted_upto = conn.execute(text("SELECT coalesce(max(seq), 0) FROM daily_log_deletes")).scalar()
+        old_mark = None if full else conn.execute(
+            text("SELECT watermark FROM job_watermarks WHERE job = :job"), {"job": JOB}
+        ).scalar()
+        if old_mark is None:
+            rows = conn.execute(text("SELECT DISTINCT pet_id FROM daily_logs"))
+        else:
+            #같은 초에 들어온 기록을 놓치지 않도록 경계값도 포함 (다시 계산해도 결과는 같음)
+            rows = conn.execute(
+                text("""
+                    SELECT pet_id FROM daily_logs WHERE updated_at >= :m
+                    UNION
+                    SELECT pet_id FROM daily_log_deletes WHERE seq <= :d
+                """),
+                {"m": old_mark, "d": deleted_upto},
+            )
+        return sorted(r[0] for r in rows), new_mark, deleted_upto
+
+def _load(pet_ids: list[int]) -> pd.DataFrame:
+    with read_engine.connect() as conn:
+        rows = conn.execute(
+            text("""
+                SELECT pet_id, user_id, log_date, weight FROM daily_logs
+                WHERE pet_id IN :ids AND weight > 0
+                ORDER BY pet_id, log_date
+            """).bindparams(bindparam("ids", expanding=True)),
+            {"ids": pet_ids},
+        ).fetchall()
+    return pd.DataFrame(rows, columns=["pet_id", "user_id", "log_date", "weight"])
+
+def _store(pet_ids: list[int], alerts: pd.DataFrame) -> None:
+    """청크에 속한 반려동물의 알림을 계산 결과로 교체"""
+    from core import repo  #워커 프로세스에서는 필요 없으므로 여기서 import
+    with write_tx() as conn:
+        conn.execute(
+            text("DELETE FROM weight_alerts WHERE pet_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": pet_ids},
+        )
+        if not alerts.empty:
+            conn.exec_driver_sql(
+                """INSERT INTO weight_alerts (user_id, pet_id, log_date, kind, weight, baseline, pct_change, zscore)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                list(alerts[["user_id", "pet_id", "log_date", "kind", "weight", "baseline", "pct_change", "zscore"]]
+                     .astype(object).itertuples(index=False, name=None)),
+            )
+        users = [r[0] for r in conn.execute(
+            text("SELECT DISTINCT user_id FROM pets WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": pet_ids},
+        )]
+        for uid in users:
+            repo.bump_generation(uid, conn)
+
+def _save_watermark(mark: str | None, deleted_upto: int) -> None:
+    """워터마크를 옮기고 이번에 반영한 삭제 기록을 비움 (그 뒤에 들어온 삭제는 다음 실행에서)"""
+    with write_tx() as conn:
+        if mark is not None:
+            conn.execute(
+                text("""
+                    INSERT INTO job_watermarks (job, watermark) VALUES (:job, :m)
+                    ON CONFLICT(job) DO UPDATE SET watermark = excluded.watermark
+                """),
+                {"job": JOB, "m": str(mark)},
+            )
+        conn.execute(text("DELETE FROM daily_log_deletes WHERE seq <= :d"), {"d": deleted_upto})
+
+def run(full: bool = False, chunk_pets: int = CHUNK_PETS, workers: int = WORKERS) -> AnomalyReport:
+    t0 = time.perf_counter()
+    report = AnomalyReport(full=full)
+    pet_ids, new_mark, deleted_upto = _changed_pets(full)
+    report.pets = len(pet_ids)
+    chunks = [pet_ids[i:i + chunk_pets] for i in range(0, len(pet_ids), chunk_pets)]
+    report.chunks = len(chunks)
+
+    def finish(ids: list[int], alerts: pd.DataFrame) -> None:
+        _store(ids, alerts)
+        report.alerts += len(alerts)
+
+    if len(chunks) <= 1 or workers <= 1:
+        for ids in chunks:
+            df = _load(ids)
+            report.rows += len(df)
+            finish(ids, detect(df))
+    else:
+        #읽기는 순서대로, 계산은 병렬로 (메모리에 올라가는 청크 수는 workers*2개 이하)
+        pending: deque[tuple[list[int], Future]] = deque()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            for ids in chunks:
+                if len(pending) >= workers * 2:
+                    done_ids, fut = pending.popleft()
+                    finish(done_ids, fut.result())
+                df = _load(ids)
+                report.rows += len(df)
+                pending.append((ids, pool.submit(detect, df)))
+            while pending:
+                done_ids, fut = pending.popleft()
+                finish(done_ids, fut.result())
+
+    _save_watermark(new_mark, deleted_upto)
+    report.watermark = None if new_mark is None else str(new_mark)
+    report.deleted_upto = deleted_upto
+    report.seconds = time.perf_counter() - t0
+    save_report(report)
+    return report
+
+def save_report(report: AnomalyReport) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text("INSERT INTO job_runs (job, report) VALUES (:job, :r)"),
+            {"job": JOB, "r": json.dumps(asdict(report), ensure_ascii=False)},
+        )
+
+
+#주기 실행 (PETCARE_ANOMALY_INTERVAL_S 초마다, 프로세스당 스레드 1개)
+ANOMALY_INTERVAL_S = float(os.environ.get("PETCARE_ANOMALY_INTERVAL_S", "0"))
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+def ensure_scheduled() -> None:
+    global _thread
+    if _thread is not None or ANOMALY_INTERVAL_S <= 0:
+        return
+    with _lock:
+        if _thread is None:
+            def loop():
+                while True:
+                    time.sleep(ANOMALY_INTERVAL_S)
+                    try:
+                        run()
+                    except Exception as e:  #다음 주기에 다시 시도
+                        print(f"weight anomaly job failed: {e}")
+            _thread = threading.Thread(target=loop, name="weight-anomaly", daemon=True)
+            _thread.start()
+
+
+if __name__ == "__main__":  #python -m core.anomaly [--full]
+    ap = argparse.ArgumentParser(prog="python -m core.anomaly")
+    ap.add_argument("--full", action="store_true", help="워터마크를 무시하고 모든 반려동물 다시 계산")
+    ap.add_argument("--chunk-pets", type=int, default=CHUNK_PETS)
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    args = ap.parse_args()
+    from core.db import init_db
+    init_db()
+    print(json.dumps(asdict(run(args.full, args.chunk_pets, args.workers)), ensure_ascii=False, indent=2))
@@ -1,7 +1,17 @@
+import math
+import os
 import re
-import bcrypt
 from sqlalchemy import text
-from core.db import engine
+from sqlalchemy.exc import IntegrityError
+from core import passwords
+from core.db import read_engine, write_tx
+from core.ratelimit import TokenBucketLimiter
+
+#관리자 (진단 화면 접근), 쉼표로 구분한 이메일 목록
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get("PETCARE_ADMIN_EMAILS", "").split(",") if e.strip()}
+
+def is_admin(user: dict | None) -> bool:
+    return bool(user) and (user.get("email") or "").lower() in ADMIN_EMAILS
 
 #이메일 형식 설정
 EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
@@ -19,15 +29,12 @@ def validate_password(pw: str) -> tuple[bool, str]:
         return False, "비밀번호에 영문자를 최소 1개 포함하세요."
     return True, ""
 
-#비밀번호 유틸
+#비밀번호 유틸 (bcrypt 계산은 core.passwords의 프로세스 풀에서 실행)
 def hash_password(password: str) -> bytes:  #비밀번호를 bcrypt 해시로 변환
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=12))
+    return passwords.hash_password(password)
 
 def check_password(password: str, hashed: bytes) -> bool:  #입력한 비밀번호가 해시와 일치하는지 확인
-    try:
-        return bcrypt.checkpw(password.encode("utf-8"), hashed)
-    except Exception:
-        return False
+    return passwords.check_password(password, hashed)
 
 #회원가입
 def create_user(email: str, password: str) -> tuple[bool, str]:
@@ -40,40 +47,81 @@ def create_user(email: str, password: str) -> tuple[bool, str]:
     if not ok:
         return False, message
     
+    email = email.lower().strip()
+
     #이메일 중복 검사
-    with engine.begin() as conn:
+    with read_engine.connect() as conn:
         exists = conn.execute(
             text("SELECT id FROM users WHERE email = :e"),
-            {"e": email.lower().strip()},
+            {"e": email},
         ).fetchone()
 
-        if exists:
-            return False, "이미 등록된 이메일입니다."
+    if exists:
+        return False, "이미 등록된 이메일입니다."
 
-        #비밀번호 해시 생성
-        hashed = hash_password(password)
+    #비밀번호 해시 생성 (트랜잭션 밖에서 실행해 DB 잠금을 잡고 있지 않도록)
+    hashed = hash_password(password)
 
-        #DB 저장
-        conn.execute(
-            text("INSERT INTO users(email, password_hash) VALUES (:e, :p)"),
-                {"e": email.lower().strip(), "p": hashed},
+    #DB 저장 (그 사이 같은 이메일로 가입된 경우 UNIQUE 제약으로 걸러짐)
+    try:
+        with write_tx() as conn:
+            conn.execute(
+                text("INSERT INTO users(email, password_hash) VALUES (:e, :p)"),
+                {"e": email, "p": hashed},
             )
+    except IntegrityError:
+        return False, "이미 등록된 이메일입니다."
     return True, "회원가입이 완료되었습니다."
 
+#로그인 시도 제한 (bcrypt 1번이 수백 ms라 대량 시도가 들어오면 CPU를 모두 차지함)
+#이메일별: 한 계정에 대한 비밀번호 대입 / 접속 IP별: 여러 계정을 돌아가며 시도하는 클라이언트
+EMAIL_LIMITER = TokenBucketLimiter(
+    "email",
+    burst=float(os.environ.get("PETCARE_LOGIN_EMAIL_BURST", "5")),
+    per_minute=float(os.environ.get("PETCARE_LOGIN_EMAIL_PER_MIN", "2")),
+)
+CLIENT_LIMITER = TokenBucketLimiter(
+    "client",
+    burst=float(os.environ.get("PETCARE_LOGIN_CLIENT_BURST", "20")),
+    per_minute=float(os.environ.get("PETCARE_LOGIN_CLIENT_PER_MIN", "10")),
+)
+
+def login_throttle_stats() -> list[dict]:
+    return [EMAIL_LIMITER.stats(), CLIENT_LIMITER.stats()]
+
 #로그인
-def verify_login(email: str, password: str) -> tuple[bool, str, dict | None]:
-    """로그인 시 이메일/비밀번호 검증"""
-    with engine.begin() as conn:
+def verify_login(email: str, password: str, client: str | None = None) -> tuple[bool, str, dict | None]:
+    """로그인 시 이메일/비밀번호 검증 (시도 횟수를 넘으면 DB 조회/해시 없이 거절)"""
+    email = email.lower().strip()
+    wait = CLIENT_LIMITER.try_acquire(client) if client else 0.0
+    if not wait:
+        wait = EMAIL_LIMITER.try_acquire(email)
+    if wait:
+        return False, f"로그인 시도가 너무 많습니다. {math.ceil(wait)}초 후 다시 시도해 주세요.", None
+
+    with read_engine.connect() as conn:
         row = conn.execute(
             text("SELECT id, email, password_hash FROM users WHERE email = :e"),
-            {"e": email.lower().strip()},
+            {"e": email},
         ).mappings().first()
 
-        if not row:
-            return False, "존재하지 않는 이메일입니다.", None
+    if not row:
+        return False, "존재하지 않는 이메일입니다.", None
 
-        if not check_password(password, row["password_hash"]):
-            return False, "비밀번호가 일치하지 않습니다.", None
+    if not check_password(password, row["password_hash"]):
+        return False, "비밀번호가 일치하지 않습니다.", None
 
-        #로그인 성공
-        return True, "로그인 성공", {"id": row["id"], "email": row["email"]}
+    #작업 강도가 바뀌었으면 새 설정으로 재해시
+    if passwords.needs_rehash(row["password_hash"]):
+        rehash_password(row["id"], password)
+
+    #로그인 성공
+    return True, "로그인 성공", {"id": row["id"], "email": row["email"]}
+
+def rehash_password(user_id: int, password: str) -> None:
+    hashed = hash_password(password)
+    with write_tx() as conn:
+        conn.execute(
+            text("UPDATE users SET password_hash = :p WHERE id = :id"),
+            {"p": hashed, "id": user_id},
+        )
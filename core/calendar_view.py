@@ -0,0 +1,94 @@
+import calendar as cal
+import html
+from datetime import date
+from functools import lru_cache
+import streamlit as st
+from core import repo
+
+#월 전체를 HTML 한 덩어리로 그려 Streamlit 요소 1개로 전송하는 캘린더
+#(주마다 st.columns, 날짜마다 container/markdown을 만들면 한 번의 rerun에 요소가 100개 이상)
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+PREVIEW_COUNT = 3
+PREVIEW_CHARS = 10
+
+CSS = """
+.cal { width: 100%; border-collapse: separate; border-spacing: 4px; table-layout: fixed; }
+.cal th { font-weight: 700; text-align: left; padding: 2px 6px; }
+.cal td { vertical-align: top; height: 84px; padding: 6px; border: 1px solid rgba(49, 51, 63, 0.2);
+          border-radius: 8px; overflow: hidden; }
+.cal td.day { cursor: pointer; }
+.cal td.day:hover { background: var(--st-secondary-background-color, #F7F7F7); }
+.cal td.selected { border: 2px solid var(--st-primary-color, #5C7AEA); }
+.cal .num { font-weight: 700; }
+.cal .today .num { color: #2563eb; }
+.cal .ev { font-size: 0.8rem; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+.cal .more { font-size: 0.75rem; opacity: 0.6; }
+"""
+
+JS = """
+export default function(component) {
+    const { data, setTriggerValue, parentElement } = component;
+    let root = parentElement.querySelector('.cal-root');
+    if (!root) {
+        root = document.createElement('div');
+        root.className = 'cal-root';
+        parentElement.appendChild(root);
+    }
+    if (root.dataset.key !== data.key) {
+        root.innerHTML = data.html;
+        root.dataset.key = data.key;
+    }
+    root.querySelectorAll('td.day').forEach((td) => {
+        td.classList.toggle('selected', td.dataset.day === data.selected);
+        td.onclick = () => setTriggerValue('day', td.dataset.day);
+    });
+}
+"""
+
+_component = st.components.v2.component("petcare_month_calendar", css=CSS, js=JS)
+
+
+def _short(title: str) -> str:
+    return title if len(title) <= PREVIEW_CHARS else title[:PREVIEW_CHARS] + "…"
+
+@lru_cache(maxsize=256)
+def render_month_html(user_id: int, year: int, month: int, version: int, today: date) -> str:
+    """(사용자, 월, 데이터 버전, 오늘) 별로 한 번만 만드는 월간 HTML"""
+    events_by_day: dict[str, list[str]] = {}
+    for ev in repo.list_events_in_month(user_id, year, month):
+        events_by_day.setdefault(ev.event_date, []).append(ev.title)
+
+    parts = ['<table class="cal"><thead><tr>']
+    parts += [f"<th>{w}</th>" for w in WEEKDAYS]
+    parts.append("</tr></thead><tbody>")
+    for week in cal.Calendar(firstweekday=cal.MONDAY).monthdayscalendar(year, month):
+        parts.append("<tr>")
+        for day_num in week:
+            if day_num == 0:
+                parts.append("<td></td>")
+                continue
+            d = date(year, month, day_num)
+            classes = "day today" if d == today else "day"
+            titles = events_by_day.get(d.isoformat(), [])
+            parts.append(f'<td class="{classes}" data-day="{d.isoformat()}"><div class="num">{day_num}</div>')
+            for t in titles[:PREVIEW_COUNT]:
+                parts.append(f'<div class="ev" title="{html.escape(t)}">{html.escape(_short(t))}</div>')
+            if len(titles) > PREVIEW_COUNT:
+                parts.append(f'<div class="more">+{len(titles) - PREVIEW_COUNT}</div>')
+            parts.append("</td>")
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+def month_calendar(user_id: int, year: int, month: int, selected: date, key: str = "month_calendar") -> date | None:
+    """월간 캘린더 표시, 날짜를 클릭한 rerun에서는 그 날짜를 반환"""
+    today = date.today()
+    version = repo.generation(user_id)
+    body = render_month_html(user_id, year, month, version, today)
+    result = _component(
+        data={"html": body, "key": f"{user_id}:{year}-{month}:{version}:{today}", "selected": selected.isoformat()},
+        key=key,
+        on_day_change=lambda: None,
+    )
+    day = getattr(result, "day", None)
+    return date.fromisoformat(day) if day else None
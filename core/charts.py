@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from functools import lru_cache
+import numpy as np
+from core import repo
+
+#몸무게 그래프 (Vega-Lite 스펙을 만들어 st.vega_lite_chart로 그림)
+#점이 화면 폭보다 많으면 LTTB(Largest-Triangle-Three-Buckets)로 모양을 유지한 채 줄임
+RANGES = {"7일": 7, "30일": 30, "1년": 365, "전체": None}
+MAX_POINTS = 400  #그래프 폭 기준 점 개수 상한
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """남길 점의 인덱스 (첫 점과 마지막 점은 항상 포함)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    #가운데 n-2개 점을 threshold-2개 구간으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        #다음 구간 평균점 (마지막 구간이면 마지막 점)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        #직전에 고른 점, 다음 구간 평균점과 만드는 삼각형 넓이가 가장 큰 점 선택
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+@lru_cache(maxsize=256)
+def weight_chart_spec(user_id: int, pet_id: int, range_label: str, version: int, today: date) -> dict | None:
+    """(반려동물, 기간, 데이터 버전) 별로 한 번만 만드는 Vega-Lite 스펙 (기록이 없으면 None)"""
+    days = RANGES[range_label]
+    since = (today - timedelta(days=days)).isoformat() if days else None
+    logs = [r for r in repo.list_daily_logs(user_id, pet_id, since=since) if r.weight]
+    if not logs:
+        return None
+    dates = np.array([np.datetime64(r.log_date[:10], "D") for r in logs])
+    weights = np.array([r.weight for r in logs], dtype=float)
+    idx = lttb(dates.astype(np.int64).astype(float), weights, MAX_POINTS)
+    values = [{"date": str(dates[i]), "weight": float(weights[i])} for i in idx]
+    return {
+        "data": {"values": values},
+        "mark": {"type": "line", "point": len(values) <= 60, "tooltip": True},
+        "encoding": {
+            "x": {"field": "date", "type": "temporal", "title": "date",
+                  "axis": {"format": "%m-%d" if days and days <= 30 else "%Y-%m"}},
+            "y": {"field": "weight", "type": "quantitative", "title": "weight (kg)",
+                  "scale": {"zero": False}},
+        },
+    }
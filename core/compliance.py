@@ -0,0 +1,92 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from core import repo
+
+#사료량/음수량/활동량 적정 여부 판정 (종별 목표량, 허용 구간)
+#한 번에 한 행이든 전체 기록이든 같은 벡터 연산으로 판정하므로 입력 폼과 기록 화면의 기준이 같음
+METRICS = ("food_g", "water_ml", "activity_min")
+#몸무게 1kg당 목표량
+PER_KG = {
+    "cat": {"food_g": 22.5, "water_ml": 55.0},
+    "dog": {"food_g": 20.0, "water_ml": 60.0},
+}
+#몸무게와 무관한 목표량
+FIXED = {
+    "cat": {"activity_min": 20.0},
+    "dog": {"activity_min": 60.0},
+}
+#목표량 대비 (하한, 상한) 비율
+TOLERANCE = {"food_g": (0.7, 1.3), "water_ml": (0.7, 1.3), "activity_min": (0.9, 1.2)}
+LOW, OK, HIGH = "부족", "적정", "과다"
+
+
+def _species(species: str | None) -> str:
+    return "cat" if (species or "").lower() == "cat" else "dog"
+
+def targets(species: str | None, weight_kg) -> pd.DataFrame:
+    """몸무게(스칼라 또는 배열)별 목표량, 컬럼은 METRICS"""
+    sp = _species(species)
+    w = np.clip(np.nan_to_num(np.atleast_1d(np.asarray(weight_kg, dtype=float))), 0.0, None)
+    out = {m: w * k for m, k in PER_KG[sp].items()}
+    out.update({m: np.full(len(w), v) for m, v in FIXED[sp].items()})
+    return pd.DataFrame(out, columns=list(METRICS))
+
+def judge(values: pd.DataFrame, target: pd.DataFrame) -> pd.DataFrame:
+    """METRICS 컬럼별 부족/적정/과다 (값이나 목표가 없으면 None)"""
+    out = {}
+    for m in METRICS:
+        v = values[m].to_numpy(dtype=float)
+        t = target[m].to_numpy(dtype=float)
+        lo, hi = TOLERANCE[m]
+        valid = ~np.isnan(v) & (t > 0)
+        label = np.select([v < t * lo, v > t * hi], [LOW, HIGH], OK).astype(object)
+        label[~valid] = None
+        out[m] = label
+    return pd.DataFrame(out, index=values.index)
+
+def evaluate(logs: pd.DataFrame, species: str | None, base_weight: float | None = None) -> pd.DataFrame:
+    """log_date, weight, METRICS 컬럼이 있는 기록 표에 목표량과 판정을 붙임
+    몸무게가 비어 있는 날은 직전 기록(없으면 프로필 몸무게)을 기준으로 목표량 계산"""
+    df = logs.reset_index(drop=True)
+    weight = pd.to_numeric(df["weight"], errors="coerce").where(lambda w: w > 0).ffill()
+    if base_weight:
+        weight = weight.fillna(base_weight)
+    t = targets(species, weight.to_numpy())
+    flags = judge(df[list(METRICS)].apply(pd.to_numeric, errors="coerce"), t)
+    return pd.concat([df, t.add_prefix("target_"), flags.add_prefix("flag_")], axis=1)
+
+def rolling_ok_rate(evaluated: pd.DataFrame, days: int = 7) -> pd.DataFrame:
+    """최근 days일 구간마다 METRICS별 적정 비율(%) (판정이 없는 날은 분모에서 제외)"""
+    idx = pd.to_datetime(evaluated["log_date"])
+    out = {}
+    for m in METRICS:
+        flag = evaluated[f"flag_{m}"]
+        ok = pd.Series(np.where(flag.isna(), np.nan, (flag == OK).astype(float)), index=idx)
+        out[m] = ok.rolling(f"{days}D").mean() * 100
+    return pd.DataFrame(out)
+
+def current_streaks(evaluated: pd.DataFrame) -> dict[str, int]:
+    """마지막 기록부터 거꾸로 날짜가 끊기지 않고 적정이 이어진 일수"""
+    if evaluated.empty:
+        return {m: 0 for m in METRICS}
+    dates = pd.to_datetime(evaluated["log_date"]).to_numpy()
+    gap = np.diff(dates).astype("timedelta64[D]").astype(int) != 1
+    out = {}
+    for m in METRICS:
+        ok = (evaluated[f"flag_{m}"] == OK).to_numpy()
+        #뒤에서부터 처음으로 끊기는 지점(적정 아님 또는 날짜 공백)까지의 길이
+        broken = ~ok[::-1]
+        broken[1:] |= gap[::-1]
+        out[m] = int(np.argmax(broken)) if broken.any() else len(ok)
+    return out
+
+@lru_cache(maxsize=256)
+def history(user_id: int, pet_id: int, species: str, base_weight: float | None, version: int) -> pd.DataFrame:
+    """반려동물의 전체 기록 판정 결과 (데이터 버전별 1회 계산, 반환값은 수정하지 말 것)"""
+    logs = repo.list_daily_logs(user_id, pet_id)
+    df = pd.DataFrame(
+        [(r.log_date, r.weight, r.food_g, r.water_ml, r.activity_min) for r in logs],
+        columns=["log_date", "weight", *METRICS],
+    )
+    return evaluate(df, species, base_weight)
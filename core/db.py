@@ -1,9 +1,153 @@
-from sqlalchemy import create_engine, text
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
+from core import telemetry
 
-#DB 파일 경로 설정
-DB_PATH = Path(__file__).resolve().parents[1] / "data" / "petcare.db"
-engine = create_engine(f"sqlite:///{DB_PATH}", future=True)
+#DB 파일 경로 설정 (PETCARE_DB_PATH로 변경 가능)
+DB_PATH = Path(os.environ.get("PETCARE_DB_PATH") or Path(__file__).resolve().parents[1] / "data" / "petcare.db")
+
+#연결 프로필 (새 풀 연결마다 적용되는 PRAGMA와 풀 정책)
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    journal_mode: str = "WAL"         #읽기와 쓰기가 서로를 막지 않도록
+    synchronous: str = "NORMAL"       #WAL에서는 NORMAL로도 커밋 손상 없음
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024
+    busy_timeout_ms: int = 5000       #잠금 대기 ("database is locked" 방지)
+    foreign_keys: bool = True
+    read_only: bool = False           #조회 전용 풀 (PRAGMA query_only)
+    write_retries: int = 0            #BEGIN IMMEDIATE가 busy로 실패했을 때 다시 시도하는 횟수
+    write_backoff_ms: float = 10.0    #재시도 대기 시작값 (시도마다 2배, 무작위 분산)
+    pool_size: int = 8
+    max_overflow: int = 8
+    pool_timeout: float = 30.0
+
+    def __post_init__(self):
+        if self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"unknown journal_mode: {self.journal_mode}")
+        if self.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"unknown synchronous level: {self.synchronous}")
+
+    @classmethod
+    def from_env(cls, prefix: str = "PETCARE_SQLITE_", base: "ConnectionProfile | None" = None) -> "ConnectionProfile":
+        """환경변수로 기본값(base) 덮어쓰기 (예: PETCARE_SQLITE_BUSY_TIMEOUT_MS=10000)"""
+        kwargs = {}
+        for name, default in cls.__dataclass_fields__.items():
+            raw = os.environ.get(prefix + name.upper())
+            if raw is None:
+                continue
+            typ = type(getattr(cls, name))
+            kwargs[name] = raw.lower() in ("1", "true", "yes", "on") if typ is bool else typ(raw)
+        return replace(base, **kwargs) if base else cls(**kwargs)
+
+    def pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA journal_mode={self.journal_mode.upper()}",
+            f"PRAGMA synchronous={self.synchronous.upper()}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            f"PRAGMA cache_size={-int(self.cache_size_kib)}",  #음수 = KiB 단위
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+            f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}",
+        ] + (["PRAGMA query_only=ON"] if self.read_only else [])
+
+#쓰기 잠금 경합 통계 (bench.replicas, 진단용)
+write_stats = {"busy_retries": 0, "busy_failures": 0, "begin_errors": 0}
+_stats_lock = threading.Lock()
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        write_stats[name] += 1
+
+def _is_busy(e: OperationalError) -> bool:
+    msg = str(e.orig).lower()
+    return "locked" in msg or "busy" in msg
+
+def make_engine(path: Path, profile: ConnectionProfile | None = None) -> Engine:
+    profile = profile or ConnectionProfile()
+    eng = create_engine(
+        f"sqlite:///{path}",
+        future=True,
+        poolclass=QueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        connect_args={"check_same_thread": False, "timeout": profile.busy_timeout_ms / 1000},
+    )
+
+    @event.listens_for(eng, "connect")
+    def _apply_profile(dbapi_conn, _record):
+        #pysqlite의 자동 BEGIN을 끄고 트랜잭션 시작은 아래 begin 이벤트에서 직접 처리
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        for pragma in profile.pragmas():
+            cur.execute(pragma)
+        cur.close()
+
+    @event.listens_for(eng, "begin")
+    def _begin(conn):
+        #쓰기 트랜잭션은 BEGIN IMMEDIATE로 시작해 처음부터 쓰기 잠금을 잡음
+        #(읽기 -> 쓰기 승격 중 SQLITE_BUSY로 바로 실패하는 상황 방지)
+        mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+        if mode != "IMMEDIATE":
+            conn.exec_driver_sql(f"BEGIN {mode}")
+            return
+        #잠금을 못 잡으면 본문을 실행하기 전이므로 BEGIN만 다시 시도하면 됨
+        for attempt in range(profile.write_retries + 1):
+            try:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                return
+            except OperationalError as e:
+                if not _is_busy(e) or attempt == profile.write_retries:
+                    _count("busy_failures" if _is_busy(e) else "begin_errors")
+                    raise
+                _count("busy_retries")
+                time.sleep(profile.write_backoff_ms / 1000 * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    return eng
+
+#여러 프로세스(streamlit run 여러 개)가 같은 DB 파일을 쓰는 배포 (PETCARE_MULTI_PROCESS=1)
+#- 조회는 query_only 연결 풀(read_engine), 쓰기는 짧은 잠금 대기 + BEGIN IMMEDIATE 재시도
+#  (한 프로세스가 busy_timeout 내내 잠금을 기다리며 연결을 붙잡지 않도록)
+#- 프로세스별 캐시는 core.repo가 DB의 세대 번호(cache_generations)로 맞춤
+MULTI_PROCESS = os.environ.get("PETCARE_MULTI_PROCESS", "").lower() in ("1", "true", "yes", "on")
+REPLICA_PROFILE = ConnectionProfile(busy_timeout_ms=200, write_retries=8, pool_size=4, max_overflow=4)
+
+_profile = ConnectionProfile.from_env(base=REPLICA_PROFILE if MULTI_PROCESS else None)
+engine = make_engine(DB_PATH, _profile)
+read_engine = make_engine(DB_PATH, replace(_profile, read_only=True)) if MULTI_PROCESS else engine
+telemetry.instrument(engine)  #SQL 실행 시간/행 수 기록 (core.telemetry)
+telemetry.instrument(read_engine)
+
+AFTER_COMMIT_KEY = "petcare_after_commit"
+
+@contextmanager
+def write_tx(eng: Engine | None = None) -> Iterator[Connection]:
+    """쓰기 트랜잭션 (with write_tx() as conn: ...), after_commit으로 등록한 함수는 커밋이 끝난 뒤 실행"""
+    hooks: list[Callable[[], None]] = []
+    with (eng or engine).execution_options(sqlite_begin="IMMEDIATE").begin() as conn:
+        conn.info[AFTER_COMMIT_KEY] = hooks
+        try:
+            yield conn
+        finally:
+            del conn.info[AFTER_COMMIT_KEY]  #info는 풀의 DBAPI 연결에 붙어 있어 다음 트랜잭션까지 남음
+    for fn in hooks:
+        fn()
+
+def after_commit(conn: Connection, fn: Callable[[], None]) -> None:
+    """write_tx 트랜잭션이 커밋된 뒤 fn 실행 (롤백되면 실행하지 않음)"""
+    conn.info[AFTER_COMMIT_KEY].append(fn)
 
 #테이블 생성
 USERS_SQL = """
@@ -87,17 +231,6 @@ PHOTOS_INX="""
 CREATE INDEX IF NOT EXISTS idx_photos_user_created ON photos(user_id, created_at DESC);
 """
 
-def init_db():  #db 초기화 함수
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with engine.begin() as conn:
-        conn.execute(text("PRAGMA foreign_keys=ON")) #외래키 활성화로 안정성 확보
-        #테이블과 인덱스 생성 함수 호출
-        conn.execute(text(USERS_SQL))
-        conn.execute(text(USERS_EMAIL_INX))
-        conn.execute(text(PETS_SQL))
-        conn.execute(text(DAILY_SQL))
-        conn.execute(text(DAILY_USER_INX))
-        conn.execute(text(DAILY_PETDATE_INX))
-        conn.execute(text(EVENTS_SQL))
-        conn.execute(text(PHOTOS_SQL))
-        conn.execute(text(PHOTOS_INX))
\ No newline at end of file
+def init_db():  #db 초기화 함수 (스키마 마이그레이션은 프로세스당 한 번만 실행)
+    from core.migrations import ensure_schema
+    ensure_schema(engine)
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from sqlalchemy import text
+from core import repo, storage
+from core.db import read_engine
+
+#계정 전체 내보내기 (수의사 제출, 탈퇴 전 보관용)
+#반려동물/일일 기록/일정/사진 정보를 CSV, JSON Lines로, 원본 사진/영상을 media/ 아래에 zip으로 묶음
+#행은 yield_per로 나눠 읽고 파일은 청크 단위로 복사하므로 계정 크기와 상관없이 메모리 사용량이 일정
+#만든 zip은 데이터 지문(fingerprint)이 같은 동안 재사용
+EXPORT_DIR = storage.ASSETS_DIR / "exports"
+YIELD_PER = 1000
+
+#(zip 안 파일 이름, 형식, SQL) - 모두 :uid 하나만 받음
+TABLES = [
+    ("pets.csv", "csv", """
+        SELECT id, name, species, breed, birth, weight, notes FROM pets WHERE user_id = :uid ORDER BY id
+    """),
+    ("daily_logs.csv", "csv", """
+        SELECT d.pet_id, p.name AS pet_name, d.log_date, d.weight, d.food_g, d.water_ml, d.activity_min,
+               d.notes, d.updated_at
+        FROM daily_logs d JOIN pets p ON p.id = d.pet_id
+        WHERE d.user_id = :uid ORDER BY d.pet_id, d.log_date
+    """),
+    ("events.jsonl", "jsonl", """
+        SELECT id, event_date, title, created_at FROM events WHERE user_id = :uid ORDER BY event_date, id
+    """),
+    ("event_series.jsonl", "jsonl", """
+        SELECT s.id, s.title, s.start_date, s.freq, s.interval, s.until, s.count,
+               (SELECT json_group_array(exdate) FROM event_exceptions x WHERE x.series_id = s.id) AS skipped
+        FROM event_series s WHERE s.user_id = :uid ORDER BY s.id
+    """),
+]
+
+PHOTOS_SQL = """
+    SELECT id, file_path, caption, created_at, sha256 FROM photos WHERE user_id = :uid ORDER BY id
+"""
+
+#데이터가 바뀌면 달라지는 값 (행 수, 최대 id, 수정 시각, 값 합계)
+FINGERPRINT_SQL = """
+SELECT
+  (SELECT json_array(count(*), max(id), total(length(name)), total(length(notes)), total(weight))
+     FROM pets WHERE user_id = :uid),
+  (SELECT json_array(count(*), max(id), max(updated_at), total(weight), total(food_g), total(water_ml),
+                     total(activity_min), total(length(notes)))
+     FROM daily_logs WHERE user_id = :uid),
+  (SELECT json_array(count(*), max(id), max(updated_at)) FROM events WHERE user_id = :uid),
+  (SELECT json_array(count(*), max(id), max(updated_at)) FROM event_series WHERE user_id = :uid),
+  (SELECT count(*) FROM event_exceptions x JOIN event_series s ON s.id = x.series_id WHERE s.user_id = :uid),
+  (SELECT json_array(count(*), max(id), total(length(caption))) FROM photos WHERE user_id = :uid)
+"""
+
+
+def fingerprint(user_id: int) -> str:
+    with read_engine.connect() as conn:
+        row = conn.execute(text(FINGERPRINT_SQL), {"uid": user_id}).one()
+    return hashlib.sha256(json.dumps(list(row)).encode()).hexdigest()[:16]
+
+@lru_cache(maxsize=256)
+def _fingerprint_at(user_id: int, version: int) -> str:
+    """같은 프로세스에서 쓰기가 없었던 동안은 지문 조회도 다시 하지 않음"""
+    return fingerprint(user_id)
+
+def _stream_rows(user_id: int, sql: str):
+    """(컬럼 이름, 행 반복자) - 결과를 YIELD_PER행씩 가져옴"""
+    with read_engine.connect() as conn:
+        result = conn.execution_options(yield_per=YIELD_PER).execute(text(sql), {"uid": user_id})
+        yield list(result.keys())
+        yield from result
+
+def _write_table(zf: zipfile.ZipFile, user_id: int, name: str, fmt: str, sql: str) -> int:
+    rows = _stream_rows(user_id, sql)
+    columns = next(rows)
+    count = 0
+    with zf.open(name, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as out:
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(columns)
+            for r in rows:
+                writer.writerow(r)
+                count += 1
+        else:
+            for r in rows:
+                out.write(json.dumps(dict(zip(columns, r)), ensure_ascii=False, default=str) + "\n")
+                count += 1
+    return count
+
+def _photo_files(user_id: int):
+    """(photo id, zip 안 경로, 실제 경로, 설명, 올린 시각)"""
+    rows = _stream_rows(user_id, PHOTOS_SQL)
+    next(rows)
+    for pid, file_path, caption, created_at, sha256 in rows:
+        src = storage.resolve(file_path)
+        yield pid, f"media/{sha256 or f'photo-{pid}'}{src.suffix.lower()}", src, caption, created_at
+
+def _write_photos(zf: zipfile.ZipFile, user_id: int) -> tuple[int, list[int]]:
+    """사진 정보(photos.jsonl)와 원본 파일(media/), 같은 내용은 한 번만 넣음
+    zip은 쓰기 핸들을 하나만 열 수 있으므로 정보와 파일을 두 번에 나눠 씀"""
+    count = 0
+    missing = []
+    with zf.open("photos.jsonl", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8") as meta:
+        for pid, arcname, src, caption, created_at in _photo_files(user_id):
+            exists = src.exists()
+            if not exists:
+                missing.append(pid)
+            meta.write(json.dumps({"id": pid, "caption": caption, "created_at": str(created_at),
+                                   "file": arcname if exists else None}, ensure_ascii=False) + "\n")
+            count += 1
+    written: set[str] = set()
+    for pid, arcname, src, _, _ in _photo_files(user_id):
+        if arcname in written or not src.exists():
+            continue
+        #사진/영상은 이미 압축된 형식이라 그대로 저장 (ZipInfo 기본값 ZIP_STORED)
+        info = zipfile.ZipInfo.from_file(src, arcname)
+        with open(src, "rb") as f, zf.open(info, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as dst:
+            shutil.copyfileobj(f, dst, storage.CHUNK_SIZE)
+        written.add(arcname)
+    return count, missing
+
+def build(user_id: int, out: Path) -> dict:
+    """zip을 out 경로에 새로 만들고 manifest 내용을 반환"""
+    manifest = {"user_id": user_id, "created_at": datetime.now().isoformat(timespec="seconds"), "files": {}}
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        for name, fmt, sql in TABLES:
+            manifest["files"][name] = _write_table(zf, user_id, name, fmt, sql)
+        manifest["files"]["photos.jsonl"], manifest["missing_photo_ids"] = _write_photos(zf, user_id)
+        zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+def export_path(user_id: int) -> Path:
+    """현재 데이터에 해당하는 zip 경로 (없으면 새로 만들고 이전 zip은 삭제)"""
+    fp = _fingerprint_at(user_id, repo.generation(user_id))
+    path = EXPORT_DIR / f"petcare-{user_id}-{fp}.zip"
+    if path.exists():
+        return path
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".part")
+    os.close(fd)
+    try:
+        build(user_id, Path(tmp))
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    for old in EXPORT_DIR.glob(f"petcare-{user_id}-*.zip"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return path
+
+
+if __name__ == "__main__":  #python -m core.export <user_id>
+    ap = argparse.ArgumentParser(prog="python -m core.export")
+    ap.add_argument("user_id", type=int)
+    args = ap.parse_args()
+    print(export_path(args.user_id))
@@ -0,0 +1,109 @@
+import argparse
+import io
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator
+import pandas as pd
+from core import repo
+
+#스프레드시트/급식기/체중계에서 내보낸 일일 기록 파일(CSV, Parquet)을 한꺼번에 가져오기
+#파일을 CHUNK_ROWS행씩 읽어 pandas로 한 번에 검사하고, 청크마다 트랜잭션 1개 + executemany로 upsert
+COLUMNS = ("log_date", "weight", "food_g", "water_ml", "activity_min", "notes")
+NUMERIC = ("weight", "food_g", "water_ml", "activity_min")
+CHUNK_ROWS = 5000
+MAX_ERRORS = 1000  #보고서에 남기는 오류 행 수 상한 (개수는 전부 셈)
+
+@dataclass
+class RowError:
+    row: int  #파일 기준 행 번호 (헤더 다음 줄이 1)
+    message: str
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+
+def read_chunks(src: BinaryIO | str | Path, filename: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """확장자에 맞게 파일을 chunk_rows행씩 읽음 (모든 값은 문자열 그대로, 검사는 validate에서)"""
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(src, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+    elif suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ValueError("Parquet 파일을 읽으려면 pyarrow가 필요합니다.") from e
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError("CSV 또는 Parquet 파일만 가져올 수 있습니다.")
+
+def validate(df: pd.DataFrame, first_row: int) -> tuple[list[tuple], list[RowError]]:
+    """청크 하나를 검사해 저장할 행(repo.upsert_daily_logs 튜플)과 오류 행을 나눔"""
+    missing = [c for c in COLUMNS if c not in df.columns and c != "notes"]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+    rows = pd.Series(range(first_row, first_row + len(df)), index=df.index)
+    problems = pd.Series("", index=df.index)
+
+    raw_dates = df["log_date"].astype(str).str.strip()
+    dates = pd.to_datetime(raw_dates, errors="coerce", format="%Y-%m-%d")  #대부분 ISO 형식이라 먼저 빠른 경로
+    retry = dates.isna() & (raw_dates != "")
+    if retry.any():
+        dates[retry] = pd.to_datetime(raw_dates[retry], errors="coerce", format="mixed")
+    problems[dates.isna()] += "log_date 형식 오류; "
+
+    values = {}
+    for col in NUMERIC:
+        raw = df[col].astype(str).str.strip().replace({"": None, "nan": None, "None": None})
+        num = pd.to_numeric(raw, errors="coerce")
+        problems[raw.notna() & num.isna()] += f"{col} 숫자 아님; "
+        problems[num < 0] += f"{col} 음수; "
+        values[col] = num
+    if "notes" in df.columns:
+        notes = df["notes"].where(df["notes"].notna(), None).astype(object)
+        notes = notes.where(notes.astype(str).str.strip() != "", None)
+    else:
+        notes = pd.Series(None, index=df.index, dtype=object)
+
+    ok = problems == ""
+    out = pd.DataFrame({
+        "log_date": dates[ok].dt.strftime("%Y-%m-%d"),
+        **{col: values[col][ok] for col in NUMERIC},
+        "notes": notes[ok],
+    }).astype(object)
+    out = out.where(out.notna(), None)
+    errors = [RowError(int(r), m.rstrip("; ")) for r, m in zip(rows[~ok], problems[~ok])]
+    return list(out.itertuples(index=False, name=None)), errors
+
+def import_logs(user_id: int, pet_id: int, src: BinaryIO | str | Path, filename: str,
+                chunk_rows: int = CHUNK_ROWS) -> ImportReport:
+    """파일 전체를 청크 단위로 검사/저장 (오류 행만 건너뛰고 나머지는 저장)"""
+    report = ImportReport()
+    if isinstance(src, (bytes, bytearray)):
+        src = io.BytesIO(src)
+    for df in read_chunks(src, filename, chunk_rows):
+        good, errors = validate(df, report.rows + 1)
+        report.rows += len(df)
+        report.error_count += len(errors)
+        report.errors.extend(errors[:MAX_ERRORS - len(report.errors)])
+        report.imported += repo.upsert_daily_logs(user_id, pet_id, good)
+    return report
+
+
+if __name__ == "__main__":  #python -m core.importer <user_id> <pet_id> <파일>
+    ap = argparse.ArgumentParser(prog="python -m core.importer")
+    ap.add_argument("user_id", type=int)
+    ap.add_argument("pet_id", type=int)
+    ap.add_argument("path")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = ap.parse_args()
+    if not any(p.id == args.pet_id for p in repo.list_pets(args.user_id)):
+        raise SystemExit("해당 사용자의 반려동물이 아닙니다.")
+    r = import_logs(args.user_id, args.pet_id, args.path, args.path, args.chunk_rows)
+    print(f"rows={r.rows} imported={r.imported} errors={r.error_count}")
+    for e in r.errors[:20]:
+        print(f"  {e.row}: {e.message}")
@@ -0,0 +1,108 @@
+import argparse
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from PIL import Image, ImageOps, features
+from core import repo, storage
+
+#업로드 시 미리 만들어 두는 축소본 (이름: 긴 변 최대 픽셀)
+RENDITIONS = {"thumb": 480, "medium": 1600}
+RENDITION_DIR = storage.ASSETS_DIR / "renditions"
+IMAGE_EXTS = {".png", ".jpg", ".jpeg"}
+VIDEO_EXTS = {".mp4", ".mov", ".avi"}
+
+#WebP를 지원하지 않는 Pillow 빌드에서는 JPEG로 저장
+FORMAT, SUFFIX = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+QUALITY = 80
+
+@dataclass(frozen=True)
+class Rendition:
+    path: str
+    width: int
+    height: int
+
+
+def is_image(path: str) -> bool:
+    return Path(path).suffix.lower() in IMAGE_EXTS
+
+def rendition_path(name: str, stem: str, out_dir: Path = RENDITION_DIR) -> Path:
+    return out_dir / name / f"{stem}{SUFFIX}"
+
+def make_renditions(src: Path, stem: str | None = None, out_dir: Path = RENDITION_DIR) -> dict[str, Rendition]:
+    """원본을 한 번만 열어 방향 보정 후 크기별 축소본 저장 (stem: 저장 파일 이름, 기본은 원본 내용의 SHA-256)
+    저장소 도입 전 업로드도 내용 해시 이름을 써야 미디어 서버가 서비스함 (업로드 시각 이름은 추측 가능)"""
+    stem = stem or storage.file_sha256(src)
+    dests = {name: rendition_path(name, stem, out_dir) for name in RENDITIONS}
+    if all(d.exists() for d in dests.values()):  #같은 내용의 사진이 이미 있으면 크기만 읽음
+        renditions = {}
+        for name, dest in dests.items():
+            os.utime(dest)  #다시 쓰이는 파일을 정리 작업(core.reconcile)이 오래된 고아 파일로 보지 않도록
+            with Image.open(dest) as img:
+                renditions[name] = Rendition(storage.relative(dest), img.width, img.height)
+        return renditions
+
+    renditions = {}
+    with Image.open(src) as img:
+        img = ImageOps.exif_transpose(img)  #사진 방향 보정
+        if img.mode not in ("RGB", "RGBA") or (FORMAT == "JPEG" and img.mode == "RGBA"):
+            img = img.convert("RGB")
+        #큰 크기부터 줄여 나가면 매번 원본에서 다시 줄이는 것보다 빠름
+        for name, max_edge in sorted(RENDITIONS.items(), key=lambda kv: -kv[1]):
+            img = img.copy()
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            dest = dests[name]
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            img.save(dest, FORMAT, quality=QUALITY)
+            renditions[name] = Rendition(storage.relative(dest), img.width, img.height)
+    return renditions
+
+def rendition_columns(renditions: dict[str, Rendition]) -> dict:
+    """photos 테이블 컬럼 값 (thumb_path, thumb_w, thumb_h, medium_path, ...)"""
+    cols = {}
+    for name in RENDITIONS:
+        r = renditions.get(name)
+        cols[f"{name}_path"] = r.path if r else None
+        cols[f"{name}_w"] = r.width if r else None
+        cols[f"{name}_h"] = r.height if r else None
+    return cols
+
+
+#기존 업로드 축소본 생성: python -m core.media backfill [--limit N]
+#영상/파일이 없는 행은 축소본 없이 남으므로 id 순으로 넘어가며 읽음 (limit = 만들 축소본 수)
+BACKFILL_BATCH = 200
+
+def backfill(limit: int | None = None) -> tuple[int, int]:
+    done = failed = 0
+    last_id = 0
+    while limit is None or done < limit:
+        rows = repo.photos_missing_renditions(BACKFILL_BATCH, after_id=last_id)
+        if not rows:
+            break
+        for photo_id, user_id, path, sha256 in rows:
+            if limit is not None and done >= limit:
+                break
+            last_id = photo_id
+            src = storage.resolve(path)
+            if not is_image(path) or not src.exists():
+                continue
+            try:
+                cols = rendition_columns(make_renditions(src, stem=sha256))
+            except OSError as e:
+                print(f"skip {path}: {e}")
+                failed += 1
+                continue
+            repo.set_photo_renditions(user_id, photo_id, cols)
+            done += 1
+    return done, failed
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(prog="python -m core.media")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    bf = sub.add_parser("backfill", help="축소본이 없는 기존 사진의 축소본 생성")
+    bf.add_argument("--limit", type=int)
+    args = ap.parse_args()
+    from core.db import init_db
+    init_db()
+    if args.cmd == "backfill":
+        done, failed = backfill(args.limit)
+        print(f"renditions created: {done}, failed: {failed}")
@@ -0,0 +1,211 @@
+"""업로드 미디어 정적 서버 (HTTP Range, ETag, 장기 캐시)
+
+PETCARE_MEDIA_BASE_URL이 설정되면 앨범은 파일 내용을 웹소켓으로 보내지 않고 이 서버의 URL만 전달
+- PETCARE_MEDIA_PORT도 설정하면 Streamlit 프로세스 안에서 서버를 한 번 띄움
+  (같은 호스트의 다른 프로세스가 이미 포트를 쓰고 있으면 그 서버를 사용)
+- 설정하지 않으면 외부 서버(nginx 등)가 assets 디렉터리를 base URL로 서비스한다고 가정
+- 단독 실행: python -m core.media_server --port 8502
+
+blobs/와 renditions/ 아래에서 이름이 내용의 SHA-256인 파일만 서비스하므로
+URL 자체가 추측 불가능하고 내용이 바뀌지 않음 (ETag = 해시, immutable 캐시)
+예전 백필이 업로드 파일 이름(업로드 시각)으로 만든 축소본은 서비스하지 않고 Streamlit으로 전달
+exports/의 계정 내보내기 zip은 export_url이 만든 서명/만료 시각이 맞는 요청만 서비스
+(zip을 Streamlit 메모리에 올리지 않고 디스크에서 Range 요청으로 바로 전송)
+"""
+import argparse
+import errno
+import hmac
+import mimetypes
+import os
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+from core import sessions, storage
+
+MEDIA_BASE_URL = os.environ.get("PETCARE_MEDIA_BASE_URL", "").rstrip("/")
+MEDIA_HOST = os.environ.get("PETCARE_MEDIA_HOST", "127.0.0.1")
+MEDIA_PORT = int(os.environ.get("PETCARE_MEDIA_PORT", "0"))
+SERVED_DIRS = ("blobs", "renditions")
+EXPORT_DIR = "exports"  #core.export.EXPORT_DIR
+EXPORT_LINK_TTL_S = 600
+COPY_CHUNK = 256 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+mimetypes.add_type("video/quicktime", ".mov")
+mimetypes.add_type("image/webp", ".webp")
+
+
+def enabled() -> bool:
+    return bool(MEDIA_BASE_URL)
+
+def url_for(path: str | None) -> str | None:
+    """DB에 저장된 경로의 공개 URL (서비스 대상이 아니거나 미디어 서버를 쓰지 않으면 None)"""
+    if not path or not enabled():
+        return None
+    try:
+        rel = storage.resolve(path).relative_to(storage.ASSETS_DIR)
+    except ValueError:
+        return None
+    if rel.parts[0] not in SERVED_DIRS or not HASH_RE.match(rel.stem):
+        return None
+    return f"{MEDIA_BASE_URL}/{quote(rel.as_posix())}"
+
+def _export_sig(name: str, exp: int) -> str:
+    return sessions.sign(f"export:{name}.{exp}")
+
+def export_url(path: Path, ttl_s: int = EXPORT_LINK_TTL_S) -> str | None:
+    """내보내기 zip의 만료되는 다운로드 링크 (미디어 서버를 쓰지 않으면 None)"""
+    if not enabled():
+        return None
+    exp = int(time.time()) + ttl_s
+    return f"{MEDIA_BASE_URL}/{EXPORT_DIR}/{quote(path.name)}?exp={exp}&sig={_export_sig(path.name, exp)}"
+
+def etag_for(path: Path, stat: os.stat_result) -> tuple[str, bool]:
+    """(ETag, 내용 해시 기반 여부)"""
+    if HASH_RE.match(path.stem):
+        return f'"{path.stem}{path.suffix}"', True
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"', False
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    server_version = "PetCareMedia/1.0"
+
+    def log_message(self, format, *args):  #요청마다 stderr에 찍지 않음
+        pass
+
+    def _resolve(self) -> Path | None:
+        url = urlsplit(self.path)
+        rel = Path(unquote(url.path).lstrip("/"))
+        if not rel.parts or ".." in rel.parts:
+            return None
+        if rel.parts[0] == EXPORT_DIR:
+            if len(rel.parts) != 2 or not self._export_allowed(rel.name, parse_qs(url.query)):
+                return None
+        elif rel.parts[0] not in SERVED_DIRS or not HASH_RE.match(rel.stem):
+            return None
+        path = storage.ASSETS_DIR / rel
+        return path if path.is_file() else None
+
+    @staticmethod
+    def _export_allowed(name: str, query: dict) -> bool:
+        exp, sig = query.get("exp", [""])[0], query.get("sig", [""])[0]
+        if not exp.isdigit() or int(exp) < time.time():
+            return False
+        return hmac.compare_digest(sig, _export_sig(name, int(exp)))
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool):
+        path = self._resolve()
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        stat = path.stat()
+        size = stat.st_size
+        etag, immutable = etag_for(path, stat)
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(etag, immutable)
+            self.end_headers()
+            return
+
+        start, end = 0, size - 1
+        status = HTTPStatus.OK
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range == etag):
+            m = RANGE_RE.match(range_header.strip())
+            if m and (m.group(1) or m.group(2)):
+                if m.group(1):
+                    start = int(m.group(1))
+                    end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+                else:  #bytes=-N (마지막 N바이트)
+                    start = max(size - int(m.group(2)), 0)
+                if start >= size or start > end:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = HTTPStatus.PARTIAL_CONTENT
+
+        length = end - start + 1
+        self.send_response(status)
+        self._common_headers(etag, immutable)
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        if path.parent.name == EXPORT_DIR:
+            self.send_header("Content-Disposition", f'attachment; filename="{path.name}"')
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+        try:
+            with open(path, "rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(COPY_CHUNK, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):  #재생 위치 이동 등으로 브라우저가 연결을 끊음
+            pass
+
+    def _common_headers(self, etag: str, immutable: bool):
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if immutable:
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        elif self.path.startswith(f"/{EXPORT_DIR}/"):  #계정 데이터라 공유 캐시에 남기지 않음
+            self.send_header("Cache-Control", "private, no-store")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+
+
+_lock = threading.Lock()
+_server: ThreadingHTTPServer | None = None
+
+def serve(host: str = MEDIA_HOST, port: int = MEDIA_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MediaHandler)
+    server.daemon_threads = True
+    return server
+
+def ensure_started() -> None:
+    """PETCARE_MEDIA_PORT가 설정된 경우 프로세스당 한 번 백그라운드 스레드로 서버 시작"""
+    global _server
+    if _server is not None or not (enabled() and MEDIA_PORT):
+        return
+    with _lock:
+        if _server is None:
+            try:
+                server = serve()
+            except OSError as e:
+                #여러 프로세스 배포(PETCARE_MULTI_PROCESS)에서는 먼저 뜬 프로세스가 포트를 잡고
+                #나머지는 그 서버를 같이 씀 (같은 assets 디렉터리). 그 프로세스가 끝나면 다음 호출에서 다시 시도
+                if e.errno != errno.EADDRINUSE:
+                    raise
+                return
+            _server = server
+            threading.Thread(target=_server.serve_forever, name="media-server", daemon=True).start()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(prog="python -m core.media_server")
+    ap.add_argument("--host", default=MEDIA_HOST)
+    ap.add_argument("--port", type=int, default=MEDIA_PORT or 8502)
+    args = ap.parse_args()
+    print(f"serving {storage.ASSETS_DIR} on http://{args.host}:{args.port}")
+    serve(args.host, args.port).serve_forever()
@@ -0,0 +1,303 @@
+import threading
+from typing import Callable
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from core import rollups, search
+from core.db import (
+    DB_PATH, write_tx, USERS_SQL, USERS_EMAIL_INX, PETS_SQL, DAILY_SQL, DAILY_USER_INX,
+    DAILY_PETDATE_INX, EVENTS_SQL, PHOTOS_SQL, PHOTOS_INX,
+)
+
+#스키마 버전은 PRAGMA user_version에 기록
+#MIGRATIONS[i]를 적용하면 user_version = i+1
+#각 단계는 중간에 멈췄다가 다시 실행돼도 안전하도록(IF NOT EXISTS, 컬럼 존재 확인) 작성
+MIGRATIONS: list[Callable[[Connection], None]] = []
+
+def migration(fn: Callable[[Connection], None]) -> Callable[[Connection], None]:
+    """마이그레이션 단계 등록 (정의 순서 = 적용 순서, 한번 배포된 단계는 수정하지 말 것)"""
+    MIGRATIONS.append(fn)
+    return fn
+
+
+#마이그레이션 유틸
+def current_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+def column_names(conn: Connection, table: str) -> set[str]:
+    #table_xinfo: 생성 열(GENERATED ALWAYS)까지 포함
+    return {r[1] for r in conn.execute(text(f"PRAGMA table_xinfo({table})"))}
+
+def add_column(conn: Connection, table: str, column: str, decl: str) -> None:
+    """컬럼이 없을 때만 추가 (decl 예: 'REAL', 'TEXT NOT NULL DEFAULT ''x''')"""
+    if column not in column_names(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {decl}"))
+
+def add_index(conn: Connection, name: str, table: str, columns: str, unique: bool = False) -> None:
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table}({columns})"))
+
+
+#마이그레이션 단계
+@migration
+def initial_schema(conn: Connection) -> None:
+    for sql in (USERS_SQL, USERS_EMAIL_INX, PETS_SQL, DAILY_SQL, DAILY_USER_INX,
+                DAILY_PETDATE_INX, EVENTS_SQL, PHOTOS_SQL, PHOTOS_INX):
+        conn.execute(text(sql))
+
+@migration
+def pets_weight(conn: Connection) -> None:
+    add_column(conn, "pets", "weight", "REAL")  #pages/daily.py에서 조회
+    add_index(conn, "idx_pets_user", "pets", "user_id")
+
+@migration
+def photo_renditions(conn: Connection) -> None:
+    #업로드 시 생성한 축소본 경로와 크기 (core.media.RENDITIONS)
+    for name in ("thumb", "medium"):
+        add_column(conn, "photos", f"{name}_path", "TEXT")
+        add_column(conn, "photos", f"{name}_w", "INTEGER")
+        add_column(conn, "photos", f"{name}_h", "INTEGER")
+
+@migration
+def photos_keyset_index(conn: Connection) -> None:
+    #앨범 키셋 페이지네이션 (created_at DESC, id DESC) 순서를 정렬 없이 인덱스로 읽도록 id까지 포함
+    conn.execute(text("DROP INDEX IF EXISTS idx_photos_user_created"))
+    add_index(conn, "idx_photos_user_created", "photos", "user_id, created_at DESC, id DESC")
+
+@migration
+def content_addressed_blobs(conn: Connection) -> None:
+    #core.storage: 내용 해시별 파일 1개, 이를 참조하는 photos 행 수를 refcount로 관리
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            sha256 TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    add_column(conn, "photos", "sha256", "TEXT")
+    add_index(conn, "idx_photos_sha256", "photos", "sha256")
+
+@migration
+def job_runs(conn: Connection) -> None:
+    #배치 작업 실행 기록 (작업 이름, JSON 결과 보고서)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS job_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job TEXT NOT NULL,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            report TEXT
+        )
+    """))
+    add_index(conn, "idx_job_runs_job", "job_runs", "job, id")
+
+@migration
+def events_user_date_index(conn: Connection) -> None:
+    #캘린더 월 단위 범위 조회와 날짜별 일정 조회용
+    add_index(conn, "idx_events_user_date", "events", "user_id, event_date")
+
+@migration
+def recurring_events(conn: Connection) -> None:
+    #반복 일정은 규칙 1행으로 저장하고 조회 구간에서만 전개 (core.recurrence)
+    #end_date: 마지막 발생일 (until/count에서 계산, 끝이 없으면 NULL)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS event_series (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            start_date DATE NOT NULL,
+            freq TEXT NOT NULL CHECK(freq IN ('daily','weekly','monthly','yearly')),
+            interval INTEGER NOT NULL DEFAULT 1 CHECK(interval >= 1),
+            until DATE,
+            count INTEGER CHECK(count IS NULL OR count >= 1),
+            end_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """))
+    add_index(conn, "idx_event_series_user_start", "event_series", "user_id, start_date")
+    #시리즈 중 특정 날짜만 빼기
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS event_exceptions (
+            series_id INTEGER NOT NULL,
+            exdate DATE NOT NULL,
+            PRIMARY KEY (series_id, exdate),
+            FOREIGN KEY (series_id) REFERENCES event_series(id) ON DELETE CASCADE
+        )
+    """))
+
+@migration
+def daily_rollups(conn: Connection) -> None:
+    #주간/월간 요약 테이블과 이를 갱신하는 트리거, 기존 기록으로 초기 집계
+    conn.execute(text(rollups.ROLLUPS_SQL))
+    for sql in rollups.TRIGGERS_V1_SQL:
+        conn.execute(text(sql))
+    rollups.rebuild(conn)
+
+@migration
+def pausable_rollup_triggers(conn: Connection) -> None:
+    #대량 가져오기용 일시 정지 테이블, 트리거를 WHEN 조건이 붙은 것으로 교체
+    conn.execute(text(rollups.PAUSED_SQL))
+    for name in rollups.TRIGGER_NAMES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    for sql in rollups.TRIGGERS_SQL:
+        conn.execute(text(sql))
+
+@migration
+def weight_alerts(conn: Connection) -> None:
+    #몸무게 급변 알림 (core.anomaly 배치 작업이 반려동물 단위로 다시 계산해 채움)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS weight_alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            pet_id INTEGER NOT NULL,
+            log_date DATE NOT NULL,
+            kind TEXT NOT NULL CHECK(kind IN ('loss','gain')),
+            weight REAL NOT NULL,
+            baseline REAL NOT NULL,
+            pct_change REAL NOT NULL,
+            zscore REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE,
+            UNIQUE (pet_id, log_date)
+        )
+    """))
+    add_index(conn, "idx_weight_alerts_user_date", "weight_alerts", "user_id, log_date DESC")
+    #배치 작업별 마지막 처리 위치 (증분 실행용)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS job_watermarks (
+            job TEXT PRIMARY KEY,
+            watermark TEXT NOT NULL
+        )
+    """))
+    #마지막 처리 이후 기록이 바뀐 반려동물 조회용
+    add_index(conn, "idx_daily_updated", "daily_logs", "updated_at")
+
+@migration
+def login_sessions(conn: Connection) -> None:
+    #로그인 유지 세션 (core.sessions, 쿠키에는 서명된 토큰만 저장)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at INTEGER NOT NULL,
+            revoked_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """))
+    add_index(conn, "idx_sessions_user", "sessions", "user_id")
+    add_index(conn, "idx_sessions_expires", "sessions", "expires_at")
+
+
+@migration
+def cache_generations(conn: Connection) -> None:
+    #프로세스 간 캐시 무효화용 사용자별 세대 번호 (PETCARE_MULTI_PROCESS, core.repo)
+    #seq는 전체에서 단조 증가하는 변경 번호라 seq > 마지막으로 본 값인 행만 읽으면 됨
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS cache_generations (
+            user_id INTEGER PRIMARY KEY,
+            generation INTEGER NOT NULL,
+            seq INTEGER NOT NULL
+        )
+    """))
+    add_index(conn, "idx_cache_generations_seq", "cache_generations", "seq")
+
+@migration
+def search_index(conn: Connection) -> None:
+    #전체 검색 문서/FTS5 색인과 동기화 트리거, 기존 기록으로 초기 색인 (core.search)
+    conn.execute(text(search.DOCS_SQL))
+    conn.execute(text(search.DOCS_USER_INX))
+    conn.execute(text(search.FTS_V1_SQL))
+    for sql in search.TRIGGERS_V1_SQL:
+        conn.execute(text(sql))
+    search.rebuild(conn)
+
+@migration
+def daily_log_deletes(conn: Connection) -> None:
+    #지워진 일일 기록의 반려동물 (updated_at 워터마크로는 삭제가 보이지 않으므로 core.anomaly가 함께 읽고 비움)
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS daily_log_deletes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pet_id INTEGER NOT NULL
+        )
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_logs_del_anomaly AFTER DELETE ON daily_logs
+        BEGIN
+            INSERT INTO daily_log_deletes (pet_id) VALUES (OLD.pet_id);
+        END
+    """))
+
+@migration
+def search_user_scope(conn: Connection) -> None:
+    #FTS 색인에 사용자 표시 열(user_tag)을 추가해 MATCH가 내 문서만 훑도록, 트리거 교체 후 다시 색인
+    add_column(conn, "search_docs", "user_tag", search.DOCS_TAG_COLUMN)
+    for name in search.TRIGGER_NAMES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text("DROP TABLE IF EXISTS search_fts"))
+    conn.execute(text(search.FTS_SQL))
+    for sql in search.TRIGGERS_SQL:
+        conn.execute(text(sql))
+    search.rebuild(conn)
+
+@migration
+def daily_log_deletes_per_pet(conn: Connection) -> None:
+    #삭제 기록을 반려동물당 한 행으로 (seq = 마지막 삭제 순번), 이상 감지 작업을 한 번이라도 돌린 뒤에만 기록
+    #(작업을 쓰지 않는 설치에서는 비울 주체가 없으므로 쌓지 않음, 첫 실행은 어차피 전체 계산)
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_daily_logs_del_anomaly"))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS daily_log_deletes_new (
+            pet_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+    """))
+    conn.execute(text("""
+        INSERT OR IGNORE INTO daily_log_deletes_new (pet_id, seq)
+        SELECT pet_id, max(id) FROM daily_log_deletes
+        WHERE EXISTS (SELECT 1 FROM job_watermarks WHERE job = 'weight_anomaly')
+        GROUP BY pet_id
+    """))
+    conn.execute(text("DROP TABLE daily_log_deletes"))
+    conn.execute(text("ALTER TABLE daily_log_deletes_new RENAME TO daily_log_deletes"))
+    add_index(conn, "idx_daily_log_deletes_seq", "daily_log_deletes", "seq")
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_logs_del_anomaly AFTER DELETE ON daily_logs
+        WHEN EXISTS (SELECT 1 FROM job_watermarks WHERE job = 'weight_anomaly')
+        BEGIN
+            INSERT INTO daily_log_deletes (pet_id, seq)
+            VALUES (OLD.pet_id, (SELECT coalesce(max(seq), 0) + 1 FROM daily_log_deletes))
+            ON CONFLICT(pet_id) DO UPDATE SET seq = excluded.seq;
+        END
+    """))
+
+#실행
+def migrate(engine: Engine) -> int:
+    """아직 적용되지 않은 단계를 순서대로 적용하고 최종 버전을 반환"""
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with write_tx(engine) as conn:
+        version = current_version(conn)
+        for i, step in enumerate(MIGRATIONS[version:], start=version + 1):
+            step(conn)
+            conn.execute(text(f"PRAGMA user_version = {i}"))
+            version = i
+    return version
+
+_lock = threading.Lock()
+_migrated = False
+
+def ensure_schema(engine: Engine) -> None:
+    """프로세스당 한 번만 마이그레이션 실행 (이후 호출은 DDL 없이 바로 반환)"""
+    global _migrated
+    if _migrated:
+        return
+    with _lock:
+        if not _migrated:
+            migrate(engine)
+            _migrated = True
+
+
+if __name__ == "__main__":  #python -m core.migrations
+    from core.db import engine
+    print(f"schema version: {migrate(engine)}")
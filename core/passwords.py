@@ -0,0 +1,68 @@
+import os
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+
+#bcrypt 작업 강도 (PETCARE_BCRYPT_ROUNDS로 변경, 바뀌면 다음 로그인 때 자동으로 재해시)
+BCRYPT_ROUNDS = int(os.environ.get("PETCARE_BCRYPT_ROUNDS", "12"))
+#해시 전용 프로세스 수와 동시에 대기할 수 있는 작업 수
+HASH_WORKERS = int(os.environ.get("PETCARE_HASH_WORKERS", "0")) or (os.cpu_count() or 1)
+MAX_PENDING = HASH_WORKERS * 4
+
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+#워커 프로세스에서 실행되는 함수
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(password, hashed)
+    except Exception:
+        return False
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                #Streamlit 서버는 스레드가 많으므로 fork 대신 spawn 사용
+                _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=mp.get_context("spawn"))
+    return _pool
+
+def _run(fn, *args):
+    """풀에 작업을 넘기고 결과를 기다림 (대기 작업이 MAX_PENDING개를 넘으면 호출 측에서 대기)"""
+    with _slots:
+        return _get_pool().submit(fn, *args).result()
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _as_bytes(hashed) -> bytes:
+    return hashed.encode("ascii") if isinstance(hashed, str) else bytes(hashed)
+
+def hash_password(password: str, rounds: int | None = None) -> bytes:
+    return _run(_hash, password.encode("utf-8"), rounds or BCRYPT_ROUNDS)
+
+def check_password(password: str, hashed) -> bool:
+    return _run(_check, password.encode("utf-8"), _as_bytes(hashed))
+
+def hash_rounds(hashed) -> int | None:
+    """bcrypt 해시($2b$12$...)에 기록된 작업 강도"""
+    try:
+        return int(_as_bytes(hashed).split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed) -> bool:
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
@@ -0,0 +1,62 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+#키(이메일, 접속 IP 등)별 토큰 버킷
+#- 키마다 [남은 토큰, 마지막 갱신 시각] 두 값만 보관하고, 키 수가 max_keys를 넘으면 가장 오래 안 쓴 키부터 제거
+#- 가장 오래된 키가 이미 가득 찬 상태(=충분히 쉬었음)면 호출 때마다 하나씩 정리해 평소에도 메모리를 늘리지 않음
+class TokenBucketLimiter:
+    def __init__(self, name: str, burst: float, per_minute: float, max_keys: int = 10_000):
+        self.name = name
+        self.burst = float(burst)
+        self.rate = per_minute / 60.0  #초당 채워지는 토큰
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.shed = 0
+        self.evicted = 0
+
+    def _refill(self, bucket: list[float], now: float) -> None:
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+
+    def _prune(self, now: float) -> None:
+        while self._buckets:
+            key, (tokens, last) = next(iter(self._buckets.items()))
+            idle_full = tokens + (now - last) * self.rate >= self.burst
+            if not idle_full and len(self._buckets) <= self.max_keys:
+                return
+            del self._buckets[key]
+            self.evicted += 1
+
+    def try_acquire(self, key: str) -> float:
+        """토큰 1개 사용. 허용이면 0, 거절이면 다시 시도할 수 있을 때까지 남은 초"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                self._refill(bucket, now)
+                self._buckets.move_to_end(key)
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                wait = 0.0
+            else:
+                self.shed += 1
+                wait = (1 - bucket[0]) / self.rate if self.rate > 0 else math.inf
+            self._prune(now)
+            return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"limiter": self.name, "keys": len(self._buckets), "allowed": self.allowed,
+                    "shed": self.shed, "evicted": self.evicted}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self.allowed = self.shed = self.evicted = 0
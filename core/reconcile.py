@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from core import repo, storage
+from core.db import read_engine, write_tx
+
+#photos 테이블과 업로드 저장소(assets/)를 맞추는 정리 작업
+#- 파일이 없는 photos 행 삭제 (blobs 참조 수도 함께 감소)
+#- 어떤 행도 참조하지 않는 blobs/renditions 파일과 오래된 임시 파일 삭제
+#- blobs.refcount를 실제 photos 행 수로 보정
+#앨범 화면은 파일 존재 여부를 확인하지 않고 이 작업에 맡김
+BATCH_SIZE = 500
+#업로드 중인 파일(이동 직후 커밋 전)을 지우지 않도록 이 시간보다 오래된 파일만 정리
+MIN_FILE_AGE_S = 3600
+
+@dataclass
+class ReconcileReport:
+    dry_run: bool = False
+    rows_scanned: int = 0
+    dangling_rows: list[int] = field(default_factory=list)
+    files_scanned: int = 0
+    orphan_files: list[str] = field(default_factory=list)
+    refcounts_fixed: int = 0
+    seconds: float = 0.0
+
+
+def _dangling_rows(report: ReconcileReport, batch_size: int) -> None:
+    """파일이 없는 photos 행을 id 순서로 batch_size개씩 확인하고 한 번에 삭제"""
+    last_id = 0
+    while True:
+        with read_engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT id, user_id, file_path FROM photos WHERE id > :last ORDER BY id LIMIT :n"),
+                {"last": last_id, "n": batch_size},
+            ).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        report.rows_scanned += len(rows)
+        missing = [(pid, uid) for pid, uid, path in rows if not storage.resolve(path).exists()]
+        if not missing:
+            continue
+        report.dangling_rows.extend(pid for pid, _ in missing)
+        if report.dry_run:
+            continue
+        with write_tx() as conn:
+            conn.execute(
+                text("DELETE FROM photos WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": [pid for pid, _ in missing]},
+            )
+            for uid in {uid for _, uid in missing}:
+                repo.bump_generation(uid, conn)
+
+def _fix_refcounts(report: ReconcileReport) -> None:
+    """blobs.refcount를 실제 참조 수로 맞추고 참조가 없는 blobs 행 삭제 (파일은 아래에서 정리)"""
+    sql_count = """
+        SELECT b.sha256 FROM blobs b
+        WHERE b.refcount != (SELECT count(*) FROM photos p WHERE p.sha256 = b.sha256)
+    """
+    if report.dry_run:
+        with read_engine.connect() as conn:
+            report.refcounts_fixed = len(conn.execute(text(sql_count)).fetchall())
+        return
+    with write_tx() as conn:
+        report.refcounts_fixed = len(conn.execute(text(sql_count)).fetchall())
+        conn.execute(text("""
+            UPDATE blobs SET refcount = (SELECT count(*) FROM photos p WHERE p.sha256 = blobs.sha256)
+        """))
+        conn.execute(text("DELETE FROM blobs WHERE refcount <= 0"))
+
+def _referenced(conn: Connection) -> tuple[set[str], set[str]]:
+    """(DB가 참조하는 내용 해시, 축소본 파일 경로)"""
+    hashes = {r[0] for r in conn.execute(text("SELECT sha256 FROM blobs"))}
+    hashes |= {r[0] for r in conn.execute(text("SELECT sha256 FROM photos WHERE sha256 IS NOT NULL"))}
+    paths = {
+        storage.resolve(p).as_posix()
+        for r in conn.execute(text("SELECT thumb_path, medium_path FROM photos"))
+        for p in r if p
+    }
+    return hashes, paths
+
+def _is_orphan(path: Path, referenced: tuple[set[str], set[str]], cutoff: float) -> bool:
+    try:
+        if path.stat().st_mtime >= cutoff:
+            return False
+    except FileNotFoundError:
+        return False
+    hashes, paths = referenced
+    sub = path.relative_to(storage.ASSETS_DIR).parts[0]
+    if sub == "tmp":
+        return True
+    if sub == "blobs":
+        return path.stem not in hashes
+    return path.stem not in hashes and path.as_posix() not in paths
+
+def _orphan_files(report: ReconcileReport, min_age_s: float, batch_size: int) -> None:
+    """DB에서 참조하지 않는 저장소 파일 삭제"""
+    with read_engine.connect() as conn:
+        referenced = _referenced(conn)
+    cutoff = time.time() - min_age_s
+    candidates = []
+    for sub in ("blobs", "renditions", "tmp"):
+        base = storage.ASSETS_DIR / sub
+        if not base.exists():
+            continue
+        for path in base.rglob("*"):
+            if not path.is_file():
+                continue
+            report.files_scanned += 1
+            if _is_orphan(path, referenced, cutoff):
+                candidates.append(path)
+    if report.dry_run:
+        report.orphan_files.extend(storage.relative(p) for p in candidates)
+        return
+    #목록을 만든 뒤 업로드가 같은 내용을 다시 등록했을 수 있으므로 쓰기 잠금을 잡고 참조/수정 시각을 다시 확인한 뒤 삭제
+    #(잠금을 쥐고 있는 동안에는 다른 연결이 커밋하지 못함, 이 트랜잭션 자체는 DB를 바꾸지 않음)
+    for i in range(0, len(candidates), batch_size):
+        with write_tx() as conn:
+            referenced = _referenced(conn)
+            for path in candidates[i:i + batch_size]:
+                if _is_orphan(path, referenced, cutoff):
+                    path.unlink(missing_ok=True)
+                    report.orphan_files.append(storage.relative(path))
+
+def run(dry_run: bool = False, batch_size: int = BATCH_SIZE, min_age_s: float = MIN_FILE_AGE_S) -> ReconcileReport:
+    t0 = time.perf_counter()
+    report = ReconcileReport(dry_run=dry_run)
+    _dangling_rows(report, batch_size)
+    _fix_refcounts(report)
+    _orphan_files(report, min_age_s, batch_size)
+    report.seconds = time.perf_counter() - t0
+    if not dry_run:
+        save_report(report)
+    return report
+
+def save_report(report: ReconcileReport) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text("INSERT INTO job_runs (job, report) VALUES ('reconcile', :r)"),
+            {"r": json.dumps(asdict(report), ensure_ascii=False)},
+        )
+
+
+#주기 실행 (PETCARE_RECONCILE_INTERVAL_S 초마다, 프로세스당 스레드 1개)
+RECONCILE_INTERVAL_S = float(os.environ.get("PETCARE_RECONCILE_INTERVAL_S", "0"))
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+def ensure_scheduled() -> None:
+    global _thread
+    if _thread is not None or RECONCILE_INTERVAL_S <= 0:
+        return
+    with _lock:
+        if _thread is None:
+            def loop():
+                while True:
+                    time.sleep(RECONCILE_INTERVAL_S)
+                    try:
+                        run()
+                    except Exception as e:  #다음 주기에 다시 시도
+                        print(f"reconcile failed: {e}")
+            _thread = threading.Thread(target=loop, name="photo-reconcile", daemon=True)
+            _thread.start()
+
+
+if __name__ == "__main__":  #python -m core.reconcile [--dry-run]
+    ap = argparse.ArgumentParser(prog="python -m core.reconcile")
+    ap.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상만 보고")
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--min-age", type=float, default=MIN_FILE_AGE_S, help="이보다 오래된 파일만 삭제 (초)")
+    args = ap.parse_args()
+    from core.db import init_db
+    init_db()
+    print(json.dumps(asdict(run(args.dry_run, args.batch_size, args.min_age)), ensure_ascii=False, indent=2))
@@ -0,0 +1,71 @@
+import calendar as cal
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+#반복 일정 규칙 (한 시리즈 = event_series 1행)과 조회 구간 단위 전개
+#n번째 발생일을 시작일에서 바로 계산하므로 전개 비용은 구간 길이에만 비례하고 시리즈 기간과 무관
+FREQS = ("daily", "weekly", "monthly", "yearly")
+
+@dataclass(frozen=True)
+class Series:
+    id: int
+    title: str
+    start_date: date
+    freq: str
+    interval: int = 1
+    until: date | None = None
+    count: int | None = None
+
+
+def add_months(d: date, months: int) -> date:
+    """월 더하기 (31일 -> 30일/2월 말처럼 해당 월의 마지막 날로 맞춤)"""
+    y, m = divmod(d.month - 1 + months, 12)
+    y += d.year
+    return date(y, m + 1, min(d.day, cal.monthrange(y, m + 1)[1]))
+
+def nth(series: Series, k: int) -> date:
+    """k번째(0부터) 발생일"""
+    step = k * series.interval
+    if series.freq == "daily":
+        return series.start_date + timedelta(days=step)
+    if series.freq == "weekly":
+        return series.start_date + timedelta(weeks=step)
+    if series.freq == "monthly":
+        return add_months(series.start_date, step)
+    return add_months(series.start_date, 12 * step)
+
+def _first_index_on_or_after(series: Series, d: date) -> int:
+    """d 이후 첫 발생일의 번호 (반복 계산 없이 바로 구함)"""
+    if d <= series.start_date:
+        return 0
+    if series.freq in ("daily", "weekly"):
+        unit = series.interval * (1 if series.freq == "daily" else 7)
+        return -(-(d - series.start_date).days // unit)  #올림 나눗셈
+    months = (d.year - series.start_date.year) * 12 + d.month - series.start_date.month
+    unit = series.interval * (1 if series.freq == "monthly" else 12)
+    k = max(months // unit, 0)
+    while nth(series, k) < d:  #말일 보정 때문에 최대 한 칸만 더 감
+        k += 1
+    return k
+
+def last_date(series: Series) -> date | None:
+    """시리즈의 마지막 발생일 (끝이 없으면 None) - 조회 구간 필터용으로 저장"""
+    candidates = []
+    if series.count is not None:
+        candidates.append(nth(series, max(series.count - 1, 0)))
+    if series.until is not None:
+        candidates.append(series.until)
+    return min(candidates) if candidates else None
+
+def occurrences(series: Series, start: date, end: date, exceptions: frozenset[date] = frozenset()) -> list[date]:
+    """[start, end) 구간의 발생일 (exceptions에 있는 날짜 제외)"""
+    out = []
+    k = _first_index_on_or_after(series, start)
+    while series.count is None or k < series.count:
+        d = nth(series, k)
+        if d >= end or (series.until is not None and d > series.until):
+            break
+        if d not in exceptions:
+            out.append(d)
+        k += 1
+    return out
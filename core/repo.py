@@ -0,0 +1,598 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, TypeVar
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from core import recurrence, rollups, search, storage, telemetry
+from core.db import MULTI_PROCESS, after_commit, init_db, read_engine, write_tx
+
+T = TypeVar("T")
+
+#home.py를 거치지 않고 페이지를 바로 열어도 스키마가 준비되도록 (프로세스당 1회)
+init_db()
+
+#조회 결과 타입
+@dataclass(frozen=True)
+class Pet:
+    id: int
+    name: str
+    species: str
+    breed: str | None
+    birth: str | None
+    weight: float | None
+    notes: str | None
+
+@dataclass(frozen=True)
+class DailyLog:
+    id: int
+    pet_id: int
+    log_date: str
+    weight: float | None
+    food_g: float | None
+    water_ml: float | None
+    activity_min: float | None
+    notes: str | None
+
+@dataclass(frozen=True)
+class Rollup:
+    period_start: str
+    entries: int
+    weight_min: float | None
+    weight_max: float | None
+    weight_avg: float | None
+    food_g: float | None
+    water_ml: float | None
+    activity_min: float | None
+
+@dataclass(frozen=True)
+class WeightAlert:
+    pet_id: int
+    pet_name: str
+    log_date: str
+    kind: str  #loss / gain
+    weight: float
+    baseline: float
+    pct_change: float
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str  #daily / pet / event / photo (core.search.SOURCES)
+    ref_id: int
+    pet_id: int | None
+    pet_name: str | None
+    doc_date: str | None
+    snippet: str  #검색어 앞뒤는 search.HL_OPEN / HL_CLOSE
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    event_date: str
+    title: str
+    series_id: int | None = None  #반복 일정에서 전개된 항목이면 event_series.id
+
+@dataclass(frozen=True)
+class Photo:
+    id: int
+    file_path: str
+    caption: str | None
+    created_at: str
+    thumb_path: str | None = None
+    thumb_w: int | None = None
+    thumb_h: int | None = None
+    medium_path: str | None = None
+    medium_w: int | None = None
+    medium_h: int | None = None
+    sha256: str | None = None
+
+
+#사용자별 캐시 (쓰기가 일어나면 세대 번호가 올라가 이전 결과는 더 이상 조회되지 않음)
+#여러 프로세스 모드에서는 세대 번호를 cache_generations 테이블에 올리고,
+#다른 프로세스가 올린 번호는 CACHE_SYNC_S 간격으로 읽어 와 반영 (같은 프로세스의 쓰기는 바로 반영)
+CACHE_MAX_ENTRIES = 2048
+CACHE_SYNC_S = float(os.environ.get("PETCARE_CACHE_SYNC_S", "0.5"))
+
+BUMP_GENERATION_SQL = """
+INSERT INTO cache_generations (user_id, generation, seq)
+VALUES (:u, 1, (SELECT coalesce(max(seq), 0) + 1 FROM cache_generations))
+ON CONFLICT(user_id) DO UPDATE SET generation = generation + 1, seq = excluded.seq
+RETURNING generation
+"""
+CHANGED_GENERATIONS_SQL = """
+SELECT user_id, generation, seq FROM cache_generations WHERE seq > :seq ORDER BY seq
+"""
+
+_lock = threading.Lock()
+_generations: dict[int, int] = {}
+_cache: "OrderedDict[tuple, object]" = OrderedDict()
+_synced_seq = 0
+_synced_at = float("-inf")
+
+def _set_generation(user_id: int, gen: int) -> None:
+    """_lock을 잡은 상태에서 호출"""
+    if gen > _generations.get(user_id, 0):
+        _generations[user_id] = gen
+        for k in [k for k in _cache if k[0] == user_id]:
+            del _cache[k]
+
+def _sync_generations() -> None:
+    global _synced_seq, _synced_at
+    now = time.monotonic()
+    with _lock:
+        if now - _synced_at < CACHE_SYNC_S:
+            return
+        _synced_at = now
+        seq = _synced_seq
+    with read_engine.connect() as conn:
+        rows = conn.execute(text(CHANGED_GENERATIONS_SQL), {"seq": seq}).fetchall()
+    with _lock:
+        for user_id, gen, row_seq in rows:
+            _set_generation(user_id, gen)
+            _synced_seq = max(_synced_seq, row_seq)
+
+def generation(user_id: int) -> int:
+    if MULTI_PROCESS:
+        _sync_generations()
+    with _lock:
+        return _generations.get(user_id, 0)
+
+def bump_generation(user_id: int, conn: Connection | None = None) -> None:
+    """사용자 데이터가 바뀌었음을 표시하고 이전 세대의 캐시를 정리
+    conn: 데이터를 바꾼 쓰기 트랜잭션 (공유 세대 번호도 같은 커밋에 포함, 이 프로세스의 캐시는 커밋된 뒤 정리)"""
+    if conn is None and MULTI_PROCESS:
+        with write_tx() as conn:
+            bump_generation(user_id, conn)
+        return
+    gen = conn.execute(text(BUMP_GENERATION_SQL), {"u": user_id}).scalar() if MULTI_PROCESS else None
+
+    def apply() -> None:
+        with _lock:
+            _set_generation(user_id, _generations.get(user_id, 0) + 1 if gen is None else gen)
+    if conn is None:
+        apply()
+    else:
+        after_commit(conn, apply)
+
+def _cached(user_id: int, key: tuple, loader: Callable[[], T]) -> T:
+    k = (user_id, generation(user_id), key)
+    with _lock:
+        if k in _cache:
+            _cache.move_to_end(k)
+            return _cache[k]
+    value = loader()
+    with _lock:
+        _cache[k] = value
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return value
+
+def _fetch(sql: str, params: dict) -> list:
+    with read_engine.connect() as conn:
+        rows = conn.execute(text(sql), params).fetchall()
+    telemetry.note_rows(len(rows))
+    return rows
+
+
+#반려동물
+def list_pets(user_id: int) -> tuple[Pet, ...]:
+    def load():
+        rows = _fetch("""
+            SELECT id, name, species, breed, birth, weight, notes
+            FROM pets
+            WHERE user_id = :uid
+            ORDER BY id
+        """, {"uid": user_id})
+        return tuple(Pet(*r) for r in rows)
+    return _cached(user_id, ("pets",), load)
+
+def add_pet(user_id: int, name: str, species: str, breed: str | None, birth: str, notes: str | None) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO pets(user_id, name, species, breed, birth, notes)
+                VALUES (:user_id, :name, :species, :breed, :birth, :notes)
+            """),
+            {"user_id": user_id, "name": name, "species": species,
+             "breed": breed, "birth": birth, "notes": notes},
+        )
+        bump_generation(user_id, conn)
+
+def delete_pet(user_id: int, pet_id: int) -> bool:
+    """현재 로그인 사용자의 소유 펫만 삭제"""
+    with write_tx() as conn:
+        res = conn.execute(
+            text("DELETE FROM pets WHERE id = :pid AND user_id = :uid"),
+            {"pid": pet_id, "uid": user_id},
+        )
+        bump_generation(user_id, conn)
+    return res.rowcount > 0
+
+
+#일일 기록
+def list_daily_logs(user_id: int, pet_id: int, since: str | None = None) -> tuple[DailyLog, ...]:
+    """since(YYYY-MM-DD)가 있으면 그 날짜 이후 기록만, 날짜 오름차순"""
+    def load():
+        rows = _fetch("""
+            SELECT id, pet_id, log_date, weight, food_g, water_ml, activity_min, notes
+            FROM daily_logs
+            WHERE user_id = :uid AND pet_id = :pid
+              AND (:since IS NULL OR log_date >= :since)
+            ORDER BY log_date
+        """, {"uid": user_id, "pid": pet_id, "since": since})
+        return tuple(DailyLog(*r) for r in rows)
+    return _cached(user_id, ("daily_logs", pet_id, since), load)
+
+#{values}: 이름 붙은 파라미터(한 건) 또는 ?(대량 executemany, 드라이버에 튜플 그대로 전달)
+UPSERT_DAILY_LOG_SQL = """
+INSERT INTO daily_logs (user_id, pet_id, log_date, weight, food_g, water_ml, activity_min, notes, updated_at)
+VALUES ({values}, CURRENT_TIMESTAMP)
+ON CONFLICT(pet_id, log_date) DO UPDATE SET
+  weight=excluded.weight,
+  food_g=excluded.food_g,
+  water_ml=excluded.water_ml,
+  activity_min=excluded.activity_min,
+  notes=excluded.notes,
+  updated_at=CURRENT_TIMESTAMP
+"""
+
+def upsert_daily_log(user_id: int, pet_id: int, log_date: str, weight: float, food_g: float,
+                     water_ml: float, activity_min: float, notes: str | None) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text(UPSERT_DAILY_LOG_SQL.format(values=":uid, :pid, :d, :w, :f, :wm, :am, :n")),
+            {"uid": user_id, "pid": pet_id, "d": log_date, "w": weight, "f": food_g,
+             "wm": water_ml, "am": activity_min, "n": notes},
+        )
+        bump_generation(user_id, conn)
+
+def upsert_daily_logs(user_id: int, pet_id: int, rows: list[tuple]) -> int:
+    """여러 날짜 기록을 트랜잭션 1개, executemany 1번으로 저장
+    rows: (log_date, weight, food_g, water_ml, activity_min, notes) 튜플
+    요약(daily_rollups)은 행마다 트리거로 갱신하지 않고 끝에 해당 기간만 한 번 재집계"""
+    if not rows:
+        return 0
+    dates = [r[0] for r in rows]
+    with write_tx() as conn:
+        rollups.pause(conn, pet_id)
+        conn.exec_driver_sql(
+            UPSERT_DAILY_LOG_SQL.format(values=", ".join("?" * 8)),
+            [(user_id, pet_id, *r) for r in rows],
+        )
+        rollups.resume(conn, pet_id, min(dates), max(dates))
+        bump_generation(user_id, conn)
+    return len(rows)
+
+def delete_daily_log(user_id: int, pet_id: int, log_date: str) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text("DELETE FROM daily_logs WHERE user_id=:uid AND pet_id=:pid AND log_date=:d"),
+            {"uid": user_id, "pid": pet_id, "d": log_date},
+        )
+        #지운 날짜의 알림은 바로 제거 (삭제 트리거가 daily_log_deletes에 남긴 반려동물은 다음 이상 감지 작업에서 다시 계산)
+        conn.execute(
+            text("DELETE FROM weight_alerts WHERE user_id=:uid AND pet_id=:pid AND log_date=:d"),
+            {"uid": user_id, "pid": pet_id, "d": log_date},
+        )
+        bump_generation(user_id, conn)
+
+def list_weight_alerts(user_id: int, since: str, pet_id: int | None = None) -> tuple[WeightAlert, ...]:
+    """since 이후 몸무게 급변 알림, 최근 날짜부터 (core.anomaly 작업 결과)"""
+    def load():
+        rows = _fetch("""
+            SELECT a.pet_id, p.name, a.log_date, a.kind, a.weight, a.baseline, a.pct_change
+            FROM weight_alerts a JOIN pets p ON p.id = a.pet_id
+            WHERE a.user_id = :uid AND a.log_date >= :since
+              AND (:pid IS NULL OR a.pet_id = :pid)
+            ORDER BY a.log_date DESC, a.pet_id
+        """, {"uid": user_id, "since": since, "pid": pet_id})
+        return tuple(WeightAlert(*r) for r in rows)
+    return _cached(user_id, ("weight_alerts", since, pet_id), load)
+
+#기록 표 정렬 기준 (화면 값 -> 컬럼, 같은 값은 날짜 순으로)
+LOG_SORT_COLUMNS = {"log_date": "log_date", "weight": "weight", "food_g": "food_g",
+                    "water_ml": "water_ml", "activity_min": "activity_min"}
+
+def list_daily_logs_page(user_id: int, pet_id: int, page: int, page_size: int, sort: str = "log_date",
+                         descending: bool = True, start: str | None = None, end: str | None = None
+                         ) -> tuple[tuple[DailyLog, ...], int]:
+    """기록 표의 한 페이지와 조건에 맞는 전체 행 수 (start~end는 양 끝 포함, page는 0부터)"""
+    column = LOG_SORT_COLUMNS[sort]
+    order = "DESC" if descending else "ASC"
+    #(pet_id, log_date) 인덱스 범위 검색이 되도록 조건을 필요한 것만 붙임
+    where = ["pet_id = :pid", "user_id = :uid"]
+    params = {"uid": user_id, "pid": pet_id, "n": page_size, "off": page * page_size}
+    if start:
+        where.append("log_date >= :start")
+        params["start"] = start
+    if end:
+        where.append("log_date <= :end")
+        params["end"] = end
+    cond = " AND ".join(where)
+    def load():
+        total = _fetch(f"SELECT count(*) FROM daily_logs WHERE {cond}", params)[0][0]
+        rows = _fetch(f"""
+            SELECT id, pet_id, log_date, weight, food_g, water_ml, activity_min, notes
+            FROM daily_logs
+            WHERE {cond}
+            ORDER BY {column} {order}, log_date {order}
+            LIMIT :n OFFSET :off
+        """, params)
+        return tuple(DailyLog(*r) for r in rows), total
+    return _cached(user_id, ("daily_logs_page", pet_id, page, page_size, sort, descending, start, end), load)
+
+def list_rollups(user_id: int, pet_id: int, period: str, since: str | None = None) -> tuple[Rollup, ...]:
+    """주간(week)/월간(month) 요약, 구간 시작일 오름차순 (트리거로 갱신되는 daily_rollups)"""
+    def load():
+        rows = _fetch("""
+            SELECT period_start, entries, weight_min, weight_max, weight_avg, food_g, water_ml, activity_min
+            FROM daily_rollups
+            WHERE user_id = :uid AND pet_id = :pid AND period = :period
+              AND (:since IS NULL OR period_start >= :since)
+            ORDER BY period_start
+        """, {"uid": user_id, "pid": pet_id, "period": period, "since": since})
+        return tuple(Rollup(str(r[0]), *r[1:]) for r in rows)
+    return _cached(user_id, ("rollups", pet_id, period, since), load)
+
+
+#일정
+def month_range(year: int, month: int) -> tuple[str, str]:
+    """[해당 월 1일, 다음 달 1일) 반열린 구간"""
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+def _events_in_range(user_id: int, start: str, end: str) -> tuple[Event, ...]:
+    """[start, end) 구간의 단일 일정 + 반복 일정 발생분 (날짜순)"""
+    #strftime() 비교 대신 날짜 범위로 조회해야 idx_events_user_date를 탐색할 수 있음
+    singles = _fetch("""
+        SELECT id, event_date, title
+        FROM events
+        WHERE user_id = :uid
+          AND event_date >= :start AND event_date < :end
+        ORDER BY event_date, id
+    """, {"uid": user_id, "start": start, "end": end})
+    events = [Event(r[0], str(r[1]), r[2]) for r in singles]
+
+    #구간과 겹치는 시리즈만 읽어서 구간 안에서만 전개
+    series_rows = _fetch("""
+        SELECT id, title, start_date, freq, interval, until, count
+        FROM event_series
+        WHERE user_id = :uid
+          AND start_date < :end
+          AND (end_date IS NULL OR end_date >= :start)
+    """, {"uid": user_id, "start": start, "end": end})
+    if series_rows:
+        with read_engine.connect() as conn:
+            ex_rows = conn.execute(
+                text("""
+                    SELECT series_id, exdate FROM event_exceptions
+                    WHERE series_id IN :ids AND exdate >= :start AND exdate < :end
+                """).bindparams(bindparam("ids", expanding=True)),
+                {"ids": [r[0] for r in series_rows], "start": start, "end": end},
+            ).fetchall()
+        exceptions: dict[int, set[date]] = {}
+        for sid, exdate in ex_rows:
+            exceptions.setdefault(sid, set()).add(date.fromisoformat(str(exdate)))
+        d_start, d_end = date.fromisoformat(start), date.fromisoformat(end)
+        for sid, title, start_date, freq, interval, until, count in series_rows:
+            series = recurrence.Series(
+                sid, title, date.fromisoformat(str(start_date)), freq, interval,
+                date.fromisoformat(str(until)) if until else None, count,
+            )
+            for d in recurrence.occurrences(series, d_start, d_end, frozenset(exceptions.get(sid, ()))):
+                events.append(Event(sid, d.isoformat(), title, series_id=sid))
+    events.sort(key=lambda e: (e.event_date, e.series_id is not None, e.id))
+    return tuple(events)
+
+def list_events_in_month(user_id: int, year: int, month: int) -> tuple[Event, ...]:
+    def load():
+        return _events_in_range(user_id, *month_range(year, month))
+    return _cached(user_id, ("events_month", year, month), load)
+
+#이전/다음 달을 미리 읽어 캐시에 넣어둠 (월 이동 버튼을 누르면 DB 조회 없이 바로 표시)
+_prefetcher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="repo-prefetch")
+
+def prefetch_adjacent_months(user_id: int, year: int, month: int) -> None:
+    for y, m in ((year - (month == 1), (month - 2) % 12 + 1), (year + (month == 12), month % 12 + 1)):
+        _prefetcher.submit(list_events_in_month, user_id, y, m)
+
+def list_events_on(user_id: int, day: str) -> tuple[Event, ...]:
+    def load():
+        end = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        return _events_in_range(user_id, day, end)
+    return _cached(user_id, ("events_day", day), load)
+
+def add_event(user_id: int, day: str, title: str) -> None:
+    with write_tx() as conn:
+        conn.execute(
+            text("""
+            INSERT INTO events (user_id, event_date, title, updated_at)
+            VALUES (:uid, :d, :title, CURRENT_TIMESTAMP)
+            """),
+            {"uid": user_id, "d": day, "title": title},
+        )
+        bump_generation(user_id, conn)
+
+def delete_event(user_id: int, event_id: int) -> None:
+    with write_tx() as conn:
+        conn.execute(text("DELETE FROM events WHERE id=:id AND user_id=:uid"),
+                     {"id": event_id, "uid": user_id})
+        bump_generation(user_id, conn)
+
+def add_event_series(user_id: int, title: str, start_date: str, freq: str, interval: int = 1,
+                     until: str | None = None, count: int | None = None) -> None:
+    """반복 일정 등록 (freq: daily/weekly/monthly/yearly, until 또는 count로 종료)"""
+    if freq not in recurrence.FREQS:
+        raise ValueError(f"unknown freq: {freq}")
+    series = recurrence.Series(0, title, date.fromisoformat(start_date), freq, interval,
+                               date.fromisoformat(until) if until else None, count)
+    last = recurrence.last_date(series)
+    with write_tx() as conn:
+        conn.execute(
+            text("""
+            INSERT INTO event_series (user_id, title, start_date, freq, interval, until, count, end_date)
+            VALUES (:uid, :title, :start, :freq, :interval, :until, :count, :end)
+            """),
+            {"uid": user_id, "title": title, "start": start_date, "freq": freq, "interval": interval,
+             "until": until, "count": count, "end": last.isoformat() if last else None},
+        )
+        bump_generation(user_id, conn)
+
+def skip_occurrence(user_id: int, series_id: int, day: str) -> None:
+    """반복 일정에서 해당 날짜만 삭제"""
+    with write_tx() as conn:
+        conn.execute(
+            text("""
+            INSERT OR IGNORE INTO event_exceptions (series_id, exdate)
+            SELECT id, :d FROM event_series WHERE id = :sid AND user_id = :uid
+            """),
+            {"sid": series_id, "uid": user_id, "d": day},
+        )
+        bump_generation(user_id, conn)
+
+def delete_event_series(user_id: int, series_id: int) -> None:
+    with write_tx() as conn:
+        conn.execute(text("DELETE FROM event_series WHERE id=:id AND user_id=:uid"),
+                     {"id": series_id, "uid": user_id})
+        bump_generation(user_id, conn)
+
+
+#사진
+PHOTO_COLUMNS = """id, file_path, caption, created_at,
+                   thumb_path, thumb_w, thumb_h, medium_path, medium_w, medium_h, sha256"""
+RENDITION_COLUMNS = ("thumb_path", "thumb_w", "thumb_h", "medium_path", "medium_w", "medium_h")
+
+def _photo(r) -> Photo:
+    return Photo(r[0], r[1], r[2], str(r[3]), *r[4:])
+
+PhotoCursor = tuple[str, int]  #(created_at, id)
+
+def list_photos_page(user_id: int, limit: int, after: PhotoCursor | None = None
+                     ) -> tuple[tuple[Photo, ...], PhotoCursor | None]:
+    """최신순 한 페이지와 다음 페이지 커서 (마지막 페이지면 None)"""
+    #OFFSET 대신 (created_at, id) 키셋으로 이어 읽어 몇 번째 페이지든 인덱스에서 limit+1개만 읽음
+    def load():
+        where = "user_id = :uid"
+        params = {"uid": user_id, "lim": limit + 1}
+        if after is not None:
+            where += " AND (created_at, id) < (:c_at, :c_id)"
+            params.update(c_at=after[0], c_id=after[1])
+        rows = _fetch(f"""
+            SELECT {PHOTO_COLUMNS}
+            FROM photos
+            WHERE {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :lim
+        """, params)
+        photos = tuple(_photo(r) for r in rows[:limit])
+        next_cursor = (photos[-1].created_at, photos[-1].id) if len(rows) > limit else None
+        return photos, next_cursor
+    return _cached(user_id, ("photos_page", limit, after), load)
+
+def add_photos(user_id: int, files: list[tuple[storage.StagedBlob, dict]], caption: str | None) -> None:
+    """files: (storage.stage()로 디스크에 기록을 마친 파일, 축소본 컬럼 값) 목록"""
+    try:
+        with write_tx() as conn:
+            for staged, renditions in files:
+                path = storage.commit_blob(conn, staged)  #중복 내용이면 참조 수만 증가
+                conn.execute(text("""
+                    INSERT INTO photos (user_id, file_path, caption, sha256,
+                                        thumb_path, thumb_w, thumb_h, medium_path, medium_w, medium_h)
+                    VALUES (:uid, :path, :cap, :sha,
+                            :thumb_path, :thumb_w, :thumb_h, :medium_path, :medium_w, :medium_h)
+                    """),
+                    {"uid": user_id, "path": path, "cap": caption, "sha": staged.sha256,
+                     **{c: renditions.get(c) for c in RENDITION_COLUMNS}})
+            bump_generation(user_id, conn)
+    finally:
+        for staged, _ in files:
+            storage.discard(staged)
+
+def delete_photo(user_id: int, photo_id: int) -> None:
+    """사진 행 삭제, 같은 파일을 쓰는 다른 행이 없을 때만 파일과 축소본 삭제"""
+    with write_tx() as conn:
+        row = conn.execute(
+            text("SELECT file_path, sha256, thumb_path, medium_path FROM photos WHERE id=:id AND user_id=:uid"),
+            {"id": photo_id, "uid": user_id},
+        ).first()
+        if row is None:
+            return
+        conn.execute(text("DELETE FROM photos WHERE id=:id AND user_id=:uid"),
+                     {"id": photo_id, "uid": user_id})
+        path, sha256, thumb_path, medium_path = row
+        if sha256 is None:  #저장소 도입 전 업로드는 행마다 파일이 따로 있음
+            unused = (path, thumb_path, medium_path)
+        else:
+            blob = storage.release_blob(conn, sha256)
+            unused = (blob, thumb_path, medium_path) if blob else ()
+        bump_generation(user_id, conn)
+    #커밋된 뒤에만 파일 삭제 (커밋이 실패하면 행과 파일이 모두 그대로 남음)
+    storage.remove_files(unused)
+
+def photos_missing_renditions(limit: int | None = None, after_id: int = 0) -> list[tuple[int, int, str, str | None]]:
+    """축소본이 없는 사진 (id, user_id, file_path, sha256), id가 after_id보다 큰 것부터 - 백필용, 캐시하지 않음"""
+    rows = _fetch("""
+        SELECT id, user_id, file_path, sha256
+        FROM photos
+        WHERE thumb_path IS NULL AND id > :after
+        ORDER BY id
+        LIMIT coalesce(:lim, -1)
+    """, {"lim": limit, "after": after_id})
+    return [tuple(r) for r in rows]
+
+def set_photo_renditions(user_id: int, photo_id: int, renditions: dict) -> None:
+    with write_tx() as conn:
+        conn.execute(text("""
+            UPDATE photos
+            SET thumb_path=:thumb_path, thumb_w=:thumb_w, thumb_h=:thumb_h,
+                medium_path=:medium_path, medium_w=:medium_w, medium_h=:medium_h
+            WHERE id=:id AND user_id=:uid
+            """),
+            {"id": photo_id, "uid": user_id, **{c: renditions.get(c) for c in RENDITION_COLUMNS}})
+        bump_generation(user_id, conn)
+
+
+#전체 검색 (core.search: FTS5 trigram 색인, 트리거로 동기화)
+#MATCH 식은 search.scoped_match로 사용자 표시(user_tag)를 붙여 색인 단계에서 내 문서로 한정
+SEARCH_FTS_SQL = """
+SELECT d.kind, d.ref_id, d.pet_id, p.name, d.doc_date,
+       snippet(search_fts, 0, :hl_open, :hl_close, '…', 24)
+FROM search_fts
+JOIN search_docs d ON d.id = search_fts.rowid
+LEFT JOIN pets p ON p.id = d.pet_id
+WHERE search_fts MATCH :match AND d.user_id = :uid {short}
+ORDER BY search_fts.rank, d.doc_date DESC
+LIMIT :n
+"""
+SEARCH_SHORT_SQL = """
+SELECT d.kind, d.ref_id, d.pet_id, p.name, d.doc_date, d.body
+FROM search_docs d
+LEFT JOIN pets p ON p.id = d.pet_id
+WHERE d.user_id = :uid {short}
+ORDER BY d.doc_date DESC
+LIMIT :n
+"""
+
+def search_records(user_id: int, query: str, limit: int = 50) -> tuple[SearchHit, ...]:
+    """일일 기록 메모, 반려동물 메모, 일정 제목, 사진 설명에서 모든 검색어를 포함하는 항목
+    (3글자 이상 검색어가 있으면 FTS 관련도 순, 2글자 이하 검색어만 있으면 최근 날짜 순)"""
+    match, short_terms = search.parse_query(query)
+    if match is None and not short_terms:
+        return ()
+    params = {"uid": user_id, "n": limit, "match": match and search.scoped_match(user_id, match),
+              "hl_open": search.HL_OPEN, "hl_close": search.HL_CLOSE}
+    short = ""
+    for i, t in enumerate(short_terms):
+        short += f" AND instr(lower(d.body), :s{i}) > 0"
+        params[f"s{i}"] = t
+    def load():
+        if match is not None:
+            rows = _fetch(SEARCH_FTS_SQL.format(short=short), params)
+            return tuple(SearchHit(*r) for r in rows)
+        rows = _fetch(SEARCH_SHORT_SQL.format(short=short), params)
+        return tuple(SearchHit(*r[:5], search.highlight(r[5], short_terms)) for r in rows)
+    return _cached(user_id, ("search", query.strip(), limit), load)
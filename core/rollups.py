@@ -0,0 +1,154 @@
+import argparse
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from core.db import write_tx
+
+#daily_logs 주간/월간 요약 (반려동물별)
+#daily_logs에 쓰기가 일어나면 트리거가 해당 날짜가 속한 주/월 구간만 다시 계산
+#(min/max는 빼기로 되돌릴 수 없으므로 값 누적 대신 최대 31행짜리 구간을 인덱스로 재집계)
+ROLLUPS_SQL = """
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    pet_id INTEGER NOT NULL,
+    period TEXT NOT NULL CHECK(period IN ('week','month')),
+    period_start DATE NOT NULL,
+    user_id INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    weight_min REAL,
+    weight_max REAL,
+    weight_avg REAL,
+    food_g REAL,
+    water_ml REAL,
+    activity_min REAL,
+    PRIMARY KEY (pet_id, period, period_start),
+    FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE
+)
+"""
+
+#대량 가져오기 중에는 행마다 재집계하지 않도록 반려동물 단위로 트리거를 멈춤
+#(쓰기 트랜잭션 안에서 넣고 빼므로 다른 연결에는 보이지 않음, 끝나면 resume이 구간을 한 번에 재집계)
+PAUSED_SQL = """
+CREATE TABLE IF NOT EXISTS rollups_paused (
+    pet_id INTEGER PRIMARY KEY
+)
+"""
+
+#월요일 시작 주
+WEEK_START = "date({d}, '-' || ((CAST(strftime('%w', {d}) AS INTEGER) + 6) % 7) || ' days')"
+MONTH_START = "date({d}, 'start of month')"
+PERIODS = {"week": (WEEK_START, "+7 days"), "month": (MONTH_START, "+1 month")}
+
+AGGREGATES = """
+    count(*), min(weight), max(weight), avg(weight),
+    sum(food_g), sum(water_ml), sum(activity_min)
+"""
+
+def _refresh_sql(pet: str, d: str) -> str:
+    """pet_id = pet, 날짜 d가 속한 주/월 구간을 다시 계산하는 SQL (트리거 본문용)"""
+    stmts = []
+    for period, (start_expr, length) in PERIODS.items():
+        start = start_expr.format(d=d)
+        stmts.append(f"""
+        DELETE FROM daily_rollups WHERE pet_id = {pet} AND period = '{period}' AND period_start = {start};
+        INSERT INTO daily_rollups (pet_id, period, period_start, user_id, entries, weight_min, weight_max,
+                                   weight_avg, food_g, water_ml, activity_min)
+        SELECT pet_id, '{period}', {start}, max(user_id), {AGGREGATES}
+        FROM daily_logs
+        WHERE pet_id = {pet} AND log_date >= {start} AND log_date < date({start}, '{length}')
+        GROUP BY pet_id;""")
+    return "".join(stmts)
+
+def _not_paused(*pets: str) -> str:
+    return " AND ".join(f"NOT EXISTS (SELECT 1 FROM rollups_paused WHERE pet_id = {p})" for p in pets)
+
+TRIGGER_NAMES = ("trg_daily_rollups_ins", "trg_daily_rollups_upd", "trg_daily_rollups_del")
+
+#처음 배포한 트리거 (rollups_paused 확인 없음) - 마이그레이션 daily_rollups 단계 전용이므로 수정하지 말 것
+TRIGGERS_V1_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_ins AFTER INSERT ON daily_logs
+    BEGIN {_refresh_sql("NEW.pet_id", "NEW.log_date")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_upd AFTER UPDATE ON daily_logs
+    BEGIN {_refresh_sql("OLD.pet_id", "OLD.log_date")} {_refresh_sql("NEW.pet_id", "NEW.log_date")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_del AFTER DELETE ON daily_logs
+    BEGIN {_refresh_sql("OLD.pet_id", "OLD.log_date")}
+    END
+    """,
+]
+
+#현재 트리거 (pausable_rollup_triggers 단계에서 교체)
+
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_ins AFTER INSERT ON daily_logs
+    WHEN {_not_paused("NEW.pet_id")}
+    BEGIN {_refresh_sql("NEW.pet_id", "NEW.log_date")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_upd AFTER UPDATE ON daily_logs
+    WHEN {_not_paused("OLD.pet_id", "NEW.pet_id")}
+    BEGIN {_refresh_sql("OLD.pet_id", "OLD.log_date")} {_refresh_sql("NEW.pet_id", "NEW.log_date")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_daily_rollups_del AFTER DELETE ON daily_logs
+    WHEN {_not_paused("OLD.pet_id")}
+    BEGIN {_refresh_sql("OLD.pet_id", "OLD.log_date")}
+    END
+    """,
+]
+
+
+def pause(conn: Connection, pet_id: int) -> None:
+    """이 트랜잭션 안에서 pet_id의 daily_logs 쓰기에 대한 트리거 재집계를 멈춤"""
+    conn.execute(text("INSERT OR IGNORE INTO rollups_paused (pet_id) VALUES (:pid)"), {"pid": pet_id})
+
+def resume(conn: Connection, pet_id: int, start: str, end: str) -> None:
+    """트리거를 다시 켜고 start~end(YYYY-MM-DD, 양 끝 포함)에 걸친 주/월 구간만 한 번에 재집계"""
+    conn.execute(text("DELETE FROM rollups_paused WHERE pet_id = :pid"), {"pid": pet_id})
+    params = {"pid": pet_id, "start": start, "end": end}
+    for period, (start_expr, length) in PERIODS.items():
+        lo = start_expr.format(d=":start")
+        hi = f"date({start_expr.format(d=':end')}, '{length}')"
+        conn.execute(text(f"""
+            DELETE FROM daily_rollups
+            WHERE pet_id = :pid AND period = '{period}' AND period_start >= {lo} AND period_start < {hi}
+        """), params)
+        conn.execute(text(f"""
+            INSERT INTO daily_rollups (pet_id, period, period_start, user_id, entries, weight_min, weight_max,
+                                       weight_avg, food_g, water_ml, activity_min)
+            SELECT pet_id, '{period}', {start_expr.format(d="log_date")}, max(user_id), {AGGREGATES}
+            FROM daily_logs
+            WHERE pet_id = :pid AND log_date >= {lo} AND log_date < {hi}
+            GROUP BY {start_expr.format(d="log_date")}
+        """), params)
+
+def rebuild(conn: Connection) -> int:
+    """전체 요약 다시 만들기 (트리거 도입 전 데이터나 어긋난 값 복구용), 만든 행 수 반환"""
+    conn.execute(text("DELETE FROM daily_rollups"))
+    for period, (start_expr, _) in PERIODS.items():
+        start = start_expr.format(d="log_date")
+        conn.execute(text(f"""
+            INSERT INTO daily_rollups (pet_id, period, period_start, user_id, entries, weight_min, weight_max,
+                                       weight_avg, food_g, water_ml, activity_min)
+            SELECT pet_id, '{period}', {start}, max(user_id), {AGGREGATES}
+            FROM daily_logs
+            GROUP BY pet_id, {start}
+        """))
+    return conn.execute(text("SELECT count(*) FROM daily_rollups")).scalar()
+
+
+if __name__ == "__main__":  #python -m core.rollups rebuild
+    ap = argparse.ArgumentParser(prog="python -m core.rollups")
+    ap.add_argument("cmd", choices=["rebuild"])
+    args = ap.parse_args()
+    from core.db import init_db
+    init_db()
+    with write_tx() as conn:
+        print(f"rollup rows: {rebuild(conn)}")
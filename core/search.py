@@ -0,0 +1,191 @@
+import argparse
+from typing import Callable
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from core.db import write_tx
+
+#메모/일정 제목/사진 설명 전체 검색 (SQLite FTS5, trigram 토크나이저)
+#- search_docs: 검색 대상 문장을 한 곳에 모은 일반 테이블, search_fts: 이를 내용으로 쓰는 FTS5 색인
+#- 원본 테이블 트리거가 두 테이블을 함께 갱신 (id = 원본 id * 4 + 종류 번호라 원본 행으로 바로 찾음)
+#- trigram은 띄어쓰기와 상관없이 3글자 이상 부분 문자열을 찾으므로 조사/어미가 붙는 한국어에 맞음
+#  2글자 이하 검색어(예: "병원")는 색인으로 찾을 수 없어 해당 사용자 문서에서 instr로 거름
+#- user_tag 열: 사용자 ID를 사용자 전용 기호 3글자(= trigram 1개)로 바꾼 값
+#  MATCH 식에 함께 넣어 다른 사용자 문서의 일치 항목까지 훑지 않고 내 문서에서만 찾음
+DOCS_SQL = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    ref_id INTEGER NOT NULL,
+    pet_id INTEGER,
+    doc_date TEXT,
+    body TEXT NOT NULL
+)
+"""
+DOCS_USER_INX = "CREATE INDEX IF NOT EXISTS idx_search_docs_user ON search_docs(user_id, doc_date DESC)"
+#처음 배포한 색인 (사용자 구분 없음) - 마이그레이션 search_index 단계 전용이므로 수정하지 말 것
+FTS_V1_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    body, content='search_docs', content_rowid='id', tokenize='trigram'
+)
+"""
+
+#user_id를 사용자 전용 영역(U+E100~U+F0FF) 문자 3개로 (12비트씩, 약 687억 명까지 구분)
+TAG_BASE, TAG_BITS = 0xE100, 12
+USER_TAG_EXPR = "char(" + ", ".join(
+    f"{TAG_BASE} + ((user_id >> {shift}) & {(1 << TAG_BITS) - 1})" for shift in (2 * TAG_BITS, TAG_BITS, 0)
+) + ")"
+DOCS_TAG_COLUMN = f"TEXT GENERATED ALWAYS AS ({USER_TAG_EXPR}) VIRTUAL"
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    body, user_tag, content='search_docs', content_rowid='id', tokenize='trigram'
+)
+"""
+
+#종류: (번호, 원본 테이블, 본문 열, pet_id 식, 날짜 식) - 식의 {r}은 NEW/OLD
+SOURCES = {
+    "daily": (0, "daily_logs", "notes", "{r}.pet_id", "{r}.log_date"),
+    "pet": (1, "pets", "notes", "{r}.id", "NULL"),
+    "event": (2, "events", "title", "NULL", "{r}.event_date"),
+    "photo": (3, "photos", "caption", "NULL", "substr({r}.created_at, 1, 10)"),
+}
+KINDS = len(SOURCES)
+
+MIN_TRIGRAM = 3
+MAX_TERMS = 8
+HL_OPEN, HL_CLOSE = "\ue000", "\ue001"  #검색어 강조 표시 (화면에서 <mark>로 바꿈)
+
+def _doc_id(kind: str, r: str) -> str:
+    return f"{r}.id * {KINDS} + {SOURCES[kind][0]}"
+
+def _indexable(kind: str, r: str) -> str:
+    #내용이 없거나 주인이 없는 예전 행(user_id NULL)은 색인하지 않음
+    col = SOURCES[kind][2]
+    return f"{r}.user_id IS NOT NULL AND trim(coalesce({r}.{col}, '')) <> ''"
+
+#처음 배포한 트리거 본문 (TRIGGERS_V1_SQL, 수정하지 말 것)
+def _add_doc_v1(kind: str) -> str:
+    _, table, col, pet, day = SOURCES[kind]
+    return f"""
+        INSERT INTO search_docs (id, user_id, kind, ref_id, pet_id, doc_date, body)
+        SELECT {_doc_id(kind, 'NEW')}, NEW.user_id, '{kind}', NEW.id, {pet.format(r='NEW')}, {day.format(r='NEW')}, NEW.{col}
+        WHERE {_indexable(kind, 'NEW')};
+        INSERT INTO search_fts (rowid, body)
+        SELECT {_doc_id(kind, 'NEW')}, NEW.{col} WHERE {_indexable(kind, 'NEW')};"""
+
+def _remove_doc_v1(kind: str) -> str:
+    return f"""
+        INSERT INTO search_fts (search_fts, rowid, body)
+        SELECT 'delete', id, body FROM search_docs WHERE id = {_doc_id(kind, 'OLD')};
+        DELETE FROM search_docs WHERE id = {_doc_id(kind, 'OLD')};"""
+
+#FTS 열 값은 방금 넣은 search_docs 행에서 읽음 (user_tag는 생성 열)
+def _add_doc(kind: str) -> str:
+    _, table, col, pet, day = SOURCES[kind]
+    return f"""
+        INSERT INTO search_docs (id, user_id, kind, ref_id, pet_id, doc_date, body)
+        SELECT {_doc_id(kind, 'NEW')}, NEW.user_id, '{kind}', NEW.id, {pet.format(r='NEW')}, {day.format(r='NEW')}, NEW.{col}
+        WHERE {_indexable(kind, 'NEW')};
+        INSERT INTO search_fts (rowid, body, user_tag)
+        SELECT id, body, user_tag FROM search_docs WHERE id = {_doc_id(kind, 'NEW')};"""
+
+def _remove_doc(kind: str) -> str:
+    #외부 내용 FTS 색인은 지울 때 색인했던 열 값을 함께 넘겨야 함
+    return f"""
+        INSERT INTO search_fts (search_fts, rowid, body, user_tag)
+        SELECT 'delete', id, body, user_tag FROM search_docs WHERE id = {_doc_id(kind, 'OLD')};
+        DELETE FROM search_docs WHERE id = {_doc_id(kind, 'OLD')};"""
+
+def _triggers(add: Callable[[str], str], remove: Callable[[str], str]) -> dict[str, str]:
+    sql = {}
+    for kind, (_, table, col, _pet, _day) in SOURCES.items():
+        sql[f"trg_search_{table}_ins"] = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_search_{table}_ins AFTER INSERT ON {table}
+    BEGIN{add(kind)}
+    END"""
+        sql[f"trg_search_{table}_upd"] = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_search_{table}_upd AFTER UPDATE ON {table}
+    WHEN OLD.{col} IS NOT NEW.{col} OR OLD.user_id IS NOT NEW.user_id
+    BEGIN{remove(kind)}{add(kind)}
+    END"""
+        sql[f"trg_search_{table}_del"] = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_search_{table}_del AFTER DELETE ON {table}
+    BEGIN{remove(kind)}
+    END"""
+    return sql
+
+_TRIGGERS = _triggers(_add_doc, _remove_doc)
+TRIGGER_NAMES = list(_TRIGGERS)
+TRIGGERS_SQL = list(_TRIGGERS.values())
+TRIGGERS_V1_SQL = list(_triggers(_add_doc_v1, _remove_doc_v1).values())  #FTS_V1_SQL용 (search_index 단계 전용)
+
+
+def rebuild(conn: Connection) -> int:
+    """원본 테이블에서 검색 문서와 FTS 색인을 다시 만들고 문서 수를 반환 (쓰기 트랜잭션 안에서 호출)"""
+    conn.execute(text("INSERT INTO search_fts (search_fts) VALUES ('delete-all')"))
+    conn.execute(text("DELETE FROM search_docs"))
+    for kind, (_, table, col, pet, day) in SOURCES.items():
+        conn.execute(text(f"""
+            INSERT INTO search_docs (id, user_id, kind, ref_id, pet_id, doc_date, body)
+            SELECT {_doc_id(kind, 't')}, t.user_id, '{kind}', t.id, {pet.format(r='t')}, {day.format(r='t')}, t.{col}
+            FROM {table} t
+            WHERE {_indexable(kind, 't')}
+        """))
+    conn.execute(text("INSERT INTO search_fts (search_fts) VALUES ('rebuild')"))
+    return conn.execute(text("SELECT count(*) FROM search_docs")).scalar()
+
+
+#검색어
+def parse_query(query: str) -> tuple[str | None, list[str]]:
+    """띄어쓰기로 나눈 검색어를 (FTS MATCH 식, 2글자 이하 검색어 목록)으로 (모든 검색어를 포함하는 문서만)"""
+    terms = []
+    for t in query.split():
+        t = t.strip('"*').lower()
+        if t and t not in terms:
+            terms.append(t)
+    terms = terms[:MAX_TERMS]
+    long_terms = ['"' + t.replace('"', '""') + '"' for t in terms if len(t) >= MIN_TRIGRAM]
+    return (" AND ".join(long_terms) or None), [t for t in terms if len(t) < MIN_TRIGRAM]
+
+def user_tag(user_id: int) -> str:
+    """USER_TAG_EXPR과 같은 값"""
+    mask = (1 << TAG_BITS) - 1
+    return "".join(chr(TAG_BASE + ((user_id >> shift) & mask)) for shift in (2 * TAG_BITS, TAG_BITS, 0))
+
+def scoped_match(user_id: int, match: str) -> str:
+    """parse_query의 MATCH 식을 user_id의 문서로 한정 (본문 열에서만 검색어를 찾음)"""
+    return f'user_tag : "{user_tag(user_id)}" AND body : ({match})'
+
+def highlight(body: str, terms: list[str], width: int = 40) -> str:
+    """짧은 검색어만 있을 때의 발췌 (첫 일치 위치 주변, FTS snippet()과 같은 강조 표시)"""
+    lower = body.lower()
+    spans = []
+    for t in terms:
+        i = lower.find(t)
+        while i >= 0:
+            spans.append((i, i + len(t)))
+            i = lower.find(t, i + 1)
+    if not spans:
+        return body[:width]
+    spans.sort()
+    start = max(spans[0][0] - width // 4, 0)
+    end = min(start + width, len(body))
+    out, pos = [], start
+    for a, b in spans:
+        a, b = max(a, pos), min(b, end)
+        if a >= b:
+            continue
+        out += [body[pos:a], HL_OPEN, body[a:b], HL_CLOSE]
+        pos = b
+    out.append(body[pos:end])
+    return ("…" if start > 0 else "") + "".join(out) + ("…" if end < len(body) else "")
+
+
+if __name__ == "__main__":  #python -m core.search rebuild
+    ap = argparse.ArgumentParser(prog="python -m core.search")
+    ap.add_argument("cmd", choices=["rebuild"])
+    args = ap.parse_args()
+    from core.db import init_db
+    init_db()
+    with write_tx() as conn:
+        print(f"search docs: {rebuild(conn)}")
@@ -0,0 +1,66 @@
+import streamlit as st
+from core import sessions
+
+#브라우저 쿠키와 st.session_state 로그인 정보 연결
+#Streamlit은 쿠키를 읽기만 할 수 있어서(st.context.cookies, 연결 시점 값) 쓰기는 작은 컴포넌트의 JS로 처리
+SESSION_KEY = "auth_user"
+COOKIE_NAME = "petcare_session"
+_TOKEN_KEY = "_session_token"      #이 브라우저 세션의 토큰 (로그아웃 시 폐기용)
+_PENDING_KEY = "_session_cookie"   #다음 rerun에 브라우저로 보낼 쿠키 (값, 유효 기간 초)
+_REJECTED_KEY = "_session_rejected"  #이미 확인해 거절한 쿠키 토큰 (rerun마다 DB 조회하지 않도록)
+
+JS = """
+export default function(component) {
+    const { data } = component;
+    const secure = location.protocol === 'https:' ? '; Secure' : '';
+    document.cookie = `${data.name}=${data.value}; Max-Age=${data.max_age}; Path=/; SameSite=Strict${secure}`;
+}
+"""
+
+_component = st.components.v2.component("petcare_session_cookie", js=JS)
+
+
+def _write_cookie(value: str, max_age: int) -> None:
+    _component(data={"name": COOKIE_NAME, "value": value, "max_age": max_age}, key="session_cookie")
+
+def _cookie_token() -> str | None:
+    try:
+        return st.context.cookies.get(COOKIE_NAME)
+    except Exception:  #브라우저 연결이 없는 실행 (AppTest 등)
+        return None
+
+def restore() -> dict | None:
+    """로그인 정보가 없으면 로그인 유지 쿠키로 복원 (각 페이지 맨 앞에서 호출)"""
+    pending = st.session_state.pop(_PENDING_KEY, None)
+    if pending is not None:
+        _write_cookie(*pending)
+    user = st.session_state.get(SESSION_KEY)
+    if user is not None:
+        return user
+    token = _cookie_token()
+    if not token or token == st.session_state.get(_REJECTED_KEY):
+        return None
+    user = sessions.verify(token)
+    if user is None:
+        st.session_state[_REJECTED_KEY] = token
+        return None
+    st.session_state[SESSION_KEY] = user
+    st.session_state[_TOKEN_KEY] = token
+    return user
+
+def login(user: dict, remember: bool) -> None:
+    """로그인 성공 처리 (remember면 세션 토큰을 만들어 쿠키에 저장)"""
+    st.session_state[SESSION_KEY] = {"id": user["id"], "email": user["email"]}
+    if remember:
+        token, max_age = sessions.create(user)
+        st.session_state[_TOKEN_KEY] = token
+        _write_cookie(token, max_age)
+
+def logout() -> None:
+    """서버에서 토큰 폐기 후 세션/쿠키 정리 (호출한 쪽에서 st.rerun())"""
+    token = st.session_state.pop(_TOKEN_KEY, None) or _cookie_token()
+    sessions.revoke(token)
+    st.session_state.pop(SESSION_KEY, None)
+    if token:
+        st.session_state[_REJECTED_KEY] = token
+    st.session_state[_PENDING_KEY] = ("", 0)
@@ -0,0 +1,126 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import text
+from core.db import DB_PATH, init_db, read_engine, write_tx
+
+#로그인 유지 세션 (새로고침/새 탭/재연결마다 bcrypt 로그인을 다시 하지 않도록)
+#- 토큰 = "세션ID.만료시각.서명", 서명은 서버 비밀키로 만든 HMAC-SHA256이라 DB 없이 위조/만료 확인
+#- 서명이 맞는 토큰은 최근 확인한 세션 LRU에서 찾고, 없거나 오래됐으면 sessions 테이블에서 폐기 여부 확인
+#- 로그아웃하면 DB에 revoked_at을 기록하고 이 프로세스의 LRU에서도 바로 제거
+#  (다른 서버 프로세스의 LRU에는 최대 CACHE_TTL_S 동안 남아 있을 수 있음)
+SESSION_DAYS = int(os.environ.get("PETCARE_SESSION_DAYS", "30"))
+CACHE_SIZE = 10_000
+CACHE_TTL_S = float(os.environ.get("PETCARE_SESSION_CACHE_TTL_S", "60"))
+SECRET_PATH = DB_PATH.parent / "session_secret"  #PETCARE_SESSION_SECRET이 없을 때 한 번 만들어 재사용
+
+INSERT_SQL = "INSERT INTO sessions (id, user_id, expires_at) VALUES (:id, :u, :exp)"
+LOOKUP_SQL = """
+SELECT s.user_id, u.email
+FROM sessions s JOIN users u ON u.id = s.user_id
+WHERE s.id = :id AND s.revoked_at IS NULL AND s.expires_at > :now
+"""
+REVOKE_SQL = "UPDATE sessions SET revoked_at = CURRENT_TIMESTAMP WHERE id = :id AND revoked_at IS NULL"
+PURGE_SQL = "DELETE FROM sessions WHERE expires_at <= :now"
+
+def _load_secret() -> bytes:
+    env = os.environ.get("PETCARE_SESSION_SECRET")
+    if env:
+        return env.encode()
+    if SECRET_PATH.exists():
+        return SECRET_PATH.read_bytes()
+    #여러 프로세스가 동시에 만들면 먼저 링크한 쪽 키를 모두 사용 (link는 이미 있으면 실패)
+    SECRET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SECRET_PATH.with_name(f".{SECRET_PATH.name}.{os.getpid()}")
+    tmp.write_bytes(secrets.token_bytes(32))
+    tmp.chmod(0o600)
+    try:
+        os.link(tmp, SECRET_PATH)
+    except FileExistsError:
+        pass
+    finally:
+        tmp.unlink()
+    return SECRET_PATH.read_bytes()
+
+_secret = _load_secret()
+_lock = threading.Lock()
+_cache: OrderedDict[str, tuple[dict, float]] = OrderedDict()  #세션ID -> (사용자, DB에서 확인한 시각)
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_secret, payload.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+def sign(payload: str) -> str:
+    """서버 비밀키 서명 (core.media_server의 내보내기 다운로드 링크 등)"""
+    return _sign(payload)
+
+def _parse(token: str | None) -> tuple[str, int] | None:
+    """서명이 맞으면 (세션ID, 만료시각) (만료 여부는 보지 않음)"""
+    if not token or token.count(".") != 2:
+        return None
+    sid, exp, sig = token.split(".")
+    if not exp.isdigit() or not hmac.compare_digest(sig, _sign(f"{sid}.{exp}")):
+        return None
+    return sid, int(exp)
+
+def _remember(sid: str, user: dict) -> None:
+    with _lock:
+        _cache[sid] = (user, time.monotonic())
+        _cache.move_to_end(sid)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+def _forget(sid: str) -> None:
+    with _lock:
+        _cache.pop(sid, None)
+
+
+def create(user: dict, days: int = SESSION_DAYS) -> tuple[str, int]:
+    """새 세션을 만들고 (토큰, 유효 기간 초)를 반환"""
+    init_db()
+    now = int(time.time())
+    max_age = days * 86400
+    sid = secrets.token_urlsafe(18)
+    with write_tx() as conn:
+        conn.execute(text(PURGE_SQL), {"now": now})  #만료된 세션 정리 (expires_at 인덱스)
+        conn.execute(text(INSERT_SQL), {"id": sid, "u": user["id"], "exp": now + max_age})
+    _remember(sid, {"id": user["id"], "email": user["email"]})
+    payload = f"{sid}.{now + max_age}"
+    return f"{payload}.{_sign(payload)}", max_age
+
+def verify(token: str | None) -> dict | None:
+    """토큰이 유효하면 로그인 사용자 {"id", "email"}, 아니면 None"""
+    parsed = _parse(token)
+    if parsed is None or parsed[1] <= time.time():
+        return None
+    sid = parsed[0]
+    with _lock:
+        hit = _cache.get(sid)
+        if hit is not None and time.monotonic() - hit[1] < CACHE_TTL_S:
+            _cache.move_to_end(sid)
+            return dict(hit[0])
+
+    init_db()
+    with read_engine.connect() as conn:
+        row = conn.execute(text(LOOKUP_SQL), {"id": sid, "now": int(time.time())}).first()
+    if row is None:
+        _forget(sid)
+        return None
+    user = {"id": row.user_id, "email": row.email}
+    _remember(sid, user)
+    return dict(user)
+
+def revoke(token: str | None) -> None:
+    """로그아웃 (서명이 맞는 토큰만 처리)"""
+    parsed = _parse(token)
+    if parsed is None:
+        return
+    _forget(parsed[0])
+    with write_tx() as conn:
+        conn.execute(text(REVOKE_SQL), {"id": parsed[0]})
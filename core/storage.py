@@ -0,0 +1,120 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+#업로드 파일 저장소 (내용의 SHA-256을 파일 이름으로 쓰는 content-addressed 저장)
+#assets/blobs/ab/abcdef...<ext>, 같은 내용은 한 번만 저장하고 blobs.refcount로 공유
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS_DIR = Path(os.environ.get("PETCARE_ASSETS_DIR") or ROOT / "assets")
+BLOB_DIR = ASSETS_DIR / "blobs"
+TMP_DIR = ASSETS_DIR / "tmp"
+CHUNK_SIZE = 1024 * 1024
+
+@dataclass(frozen=True)
+class StagedBlob:
+    """디스크에 기록/fsync까지 끝났지만 아직 저장소에 등록되지 않은 업로드"""
+    tmp_path: Path
+    sha256: str
+    size: int
+    ext: str
+
+
+def resolve(path: str) -> Path:
+    """DB에 저장된 경로(프로젝트 루트 기준 상대경로 또는 절대경로)를 실제 경로로"""
+    p = Path(path)
+    return p if p.is_absolute() else ROOT / p
+
+def relative(path: Path) -> str:
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+def blob_path(sha256: str, ext: str) -> Path:
+    return BLOB_DIR / sha256[:2] / f"{sha256}{ext}"
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _fsync_dir(path: Path) -> None:
+    if os.name == "nt":  #Windows는 디렉터리 fsync 미지원
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def stage(stream: BinaryIO, ext: str) -> StagedBlob:
+    """청크 단위로 임시 파일에 쓰면서 SHA-256 계산 (DB 트랜잭션 밖에서 호출)"""
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    h = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=TMP_DIR, suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := stream.read(CHUNK_SIZE):
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return StagedBlob(Path(tmp), h.hexdigest(), size, ext.lower())
+
+def discard(staged: StagedBlob) -> None:
+    """commit_blob에서 쓰이지 않은(중복이었던) 임시 파일 정리"""
+    staged.tmp_path.unlink(missing_ok=True)
+
+
+#아래 두 함수는 쓰기 트랜잭션(write_tx) 안에서 호출
+#파일 이동/삭제가 DB 쓰기 잠금 안에서 일어나므로 업로드와 삭제가 엇갈려도 파일이 사라지지 않음
+def commit_blob(conn: Connection, staged: StagedBlob) -> str:
+    """참조 수를 1 올리고 처음 보는 내용이면 임시 파일을 저장소로 이동, 저장 경로 반환"""
+    row = conn.execute(text("SELECT path FROM blobs WHERE sha256 = :h"), {"h": staged.sha256}).first()
+    if row:
+        conn.execute(text("UPDATE blobs SET refcount = refcount + 1 WHERE sha256 = :h"), {"h": staged.sha256})
+        path = row[0]
+        if resolve(path).exists():
+            return path
+    else:
+        path = relative(blob_path(staged.sha256, staged.ext))
+        conn.execute(
+            text("INSERT INTO blobs (sha256, path, size, refcount) VALUES (:h, :p, :s, 1)"),
+            {"h": staged.sha256, "p": path, "s": staged.size},
+        )
+    dest = resolve(path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(staged.tmp_path, dest)
+    _fsync_dir(dest.parent)
+    return path
+
+def release_blob(conn: Connection, sha256: str) -> str | None:
+    """참조 수를 1 내리고 0이 되면 blobs 행을 지우고 파일 경로를 반환
+    파일은 호출한 쪽이 트랜잭션이 커밋된 뒤에 삭제 (롤백되면 행이 남으므로 파일도 남아 있어야 함)"""
+    conn.execute(text("UPDATE blobs SET refcount = refcount - 1 WHERE sha256 = :h"), {"h": sha256})
+    row = conn.execute(
+        text("SELECT path FROM blobs WHERE sha256 = :h AND refcount <= 0"), {"h": sha256}
+    ).first()
+    if not row:
+        return None
+    conn.execute(text("DELETE FROM blobs WHERE sha256 = :h"), {"h": sha256})
+    return row[0]
+
+def remove_files(paths: Iterable[str | None]) -> None:
+    """DB 경로 목록의 파일 삭제 (None/이미 없는 파일은 무시)"""
+    for p in paths:
+        if p:
+            resolve(p).unlink(missing_ok=True)
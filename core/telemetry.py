@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+#rerun/SQL 계측 (느린 페이지가 SQL 때문인지, 이미지 처리 때문인지, 화면 요소 때문인지 구분용)
+#- 페이지마다 rerun 1번 = span 1개 (page_span), 그 안의 SQL 실행 시간/행 수와 step() 구간 시간을 합산
+#- 표본(SAMPLE_RATE)으로 뽑힌 rerun과 기준보다 느린 rerun/SQL만 JSON 한 줄로 기록하고 집계에 반영
+#- 시간 측정 자체는 perf_counter 두 번이라 항상 켜 둬도 부담이 거의 없음
+SAMPLE_RATE = float(os.environ.get("PETCARE_TRACE_SAMPLE", "0.05"))
+SLOW_QUERY_MS = float(os.environ.get("PETCARE_SLOW_QUERY_MS", "100"))
+SLOW_PAGE_MS = float(os.environ.get("PETCARE_SLOW_PAGE_MS", "1000"))
+LOG_PATH = os.environ.get("PETCARE_TRACE_LOG")  #JSON Lines 파일 (없으면 stderr)
+MAX_STATEMENTS = 500  #집계하는 SQL 문 종류 상한
+RECENT = 200          #최근 기록 보관 개수
+
+@dataclass
+class Span:
+    page: str
+    sampled: bool
+    started_at: float = field(default_factory=time.time)
+    t0: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    sql_ms: float = 0.0
+    steps: dict[str, float] = field(default_factory=dict)
+    records: list[dict] = field(default_factory=list)  #표본일 때만 채움
+
+_span: ContextVar[Span | None] = ContextVar("petcare_span", default=None)
+_last_query: ContextVar[dict | None] = ContextVar("petcare_last_query", default=None)
+
+_lock = threading.Lock()
+_statements: dict[str, dict] = {}
+_pages: dict[str, dict] = {}
+_recent_spans: deque = deque(maxlen=RECENT)
+_recent_slow_queries: deque = deque(maxlen=RECENT)
+
+_log = logging.getLogger("petcare.trace")
+_log.propagate = False
+if not _log.handlers:
+    _handler = logging.FileHandler(LOG_PATH, encoding="utf-8") if LOG_PATH else logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(_handler)
+    _log.setLevel(logging.INFO)
+
+
+def set_sample_rate(rate: float) -> None:
+    global SAMPLE_RATE
+    SAMPLE_RATE = min(max(rate, 0.0), 1.0)
+
+def _emit(kind: str, **data) -> None:
+    _log.info(json.dumps({"type": kind, "ts": round(time.time(), 3), **data}, ensure_ascii=False, default=str))
+
+_WS = re.compile(r"\s+")
+
+def _normalize(statement: str) -> str:
+    return _WS.sub(" ", statement).strip()[:300]
+
+
+#SQL (SQLAlchemy 엔진 이벤트)
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("petcare_t0", []).append(time.perf_counter())
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    ms = (time.perf_counter() - conn.info["petcare_t0"].pop()) * 1000
+    span = _span.get()
+    if span is not None:
+        span.queries += 1
+        span.sql_ms += ms
+    sampled = span.sampled if span is not None else random.random() < SAMPLE_RATE
+    slow = ms >= SLOW_QUERY_MS
+    if not (sampled or slow):
+        _last_query.set(None)
+        return
+    rec = {"sql": _normalize(statement), "ms": round(ms, 3), "rows": cursor.rowcount if cursor.rowcount >= 0 else None,
+           "many": bool(executemany), "page": span.page if span else None}
+    _record_statement(rec)
+    if span is not None and span.sampled:
+        span.records.append(rec)
+    if slow:
+        with _lock:
+            _recent_slow_queries.append(rec)
+        if span is None or not span.sampled:
+            _emit("slow_query", **rec)
+    _last_query.set(rec)
+
+def _on_error(context):
+    #실패한 실행은 after 이벤트가 없으므로 시작 시각만 정리 (busy로 재시도하는 BEGIN 등)
+    conn = context.connection
+    if context.statement is not None and conn is not None and conn.info.get("petcare_t0"):
+        conn.info["petcare_t0"].pop()
+
+def _record_statement(rec: dict) -> None:
+    with _lock:
+        st = _statements.get(rec["sql"])
+        if st is None:
+            if len(_statements) >= MAX_STATEMENTS:
+                return
+            st = _statements[rec["sql"]] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+        st["count"] += 1
+        st["total_ms"] += rec["ms"]
+        st["max_ms"] = max(st["max_ms"], rec["ms"])
+        st["rows"] += rec["rows"] or 0
+
+def note_rows(n: int) -> None:
+    """방금 기록한 SELECT의 결과 행 수 (커서에서는 fetch 전이라 알 수 없으므로 읽은 쪽에서 알려 줌)"""
+    rec = _last_query.get()
+    if rec is None or rec["rows"] is not None:
+        return
+    rec["rows"] = n
+    with _lock:
+        st = _statements.get(rec["sql"])
+        if st is not None:
+            st["rows"] += n
+
+def instrument(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+        event.listen(engine, "handle_error", _on_error)
+
+
+#페이지 rerun
+@contextmanager
+def page_span(page: str):
+    """페이지 스크립트 전체를 감싸는 span (home.py 라우터에서 사용, st.stop/st.rerun으로 끝나도 기록)"""
+    span = Span(page, random.random() < SAMPLE_RATE)
+    token = _span.set(span)
+    error = None
+    try:
+        yield span
+    except BaseException as e:
+        #st.stop()/st.rerun()은 예외로 스크립트를 끝내므로 오류가 아님
+        name = type(e).__name__
+        if name not in ("StopException", "RerunException"):
+            error = name
+        raise
+    finally:
+        _span.reset(token)
+        _finish(span, error)
+
+@contextmanager
+def step(name: str):
+    """현재 span 안의 구간 시간 (이미지 처리, 그래프 생성 등)"""
+    span = _span.get()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if span is not None:
+            span.steps[name] = span.steps.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+def _finish(span: Span, error: str | None) -> None:
+    ms = (time.perf_counter() - span.t0) * 1000
+    other_ms = ms - span.sql_ms - sum(span.steps.values())
+    with _lock:
+        p = _pages.setdefault(span.page, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "recent": deque(maxlen=RECENT)})
+        p["count"] += 1
+        p["total_ms"] += ms
+        p["max_ms"] = max(p["max_ms"], ms)
+        p["recent"].append(ms)
+    slow = ms >= SLOW_PAGE_MS
+    if not (span.sampled or slow or error):
+        return
+    data = {"page": span.page, "ms": round(ms, 1), "sql_ms": round(span.sql_ms, 1), "queries": span.queries,
+            "steps": {k: round(v, 1) for k, v in span.steps.items()}, "other_ms": round(other_ms, 1),
+            "error": error, "sampled": span.sampled}
+    with _lock:
+        _recent_spans.append({**data, "started_at": span.started_at})
+    _emit("rerun", **data, sql=span.records)
+
+
+#진단 화면용
+def snapshot() -> dict:
+    with _lock:
+        pages = []
+        for name, p in _pages.items():
+            recent = sorted(p["recent"])
+            pages.append({"page": name, "count": p["count"], "avg_ms": p["total_ms"] / p["count"],
+                          "p95_ms": recent[int(len(recent) * 0.95) - 1] if len(recent) >= 20 else recent[-1],
+                          "max_ms": p["max_ms"]})
+        statements = [{"sql": sql, **s, "avg_ms": s["total_ms"] / s["count"]} for sql, s in _statements.items()]
+        return {
+            "sample_rate": SAMPLE_RATE,
+            "pages": sorted(pages, key=lambda p: p["p95_ms"], reverse=True),
+            "statements": sorted(statements, key=lambda s: s["total_ms"], reverse=True),
+            "recent_spans": list(_recent_spans)[::-1],
+            "slow_queries": list(_recent_slow_queries)[::-1],
+        }
+
+def reset() -> None:
+    with _lock:
+        _statements.clear()
+        _pages.clear()
+        _recent_spans.clear()
+        _recent_slow_queries.clear()
@@ -1,36 +1,23 @@
 import streamlit as st
-from core.db import init_db
-
-init_db()  #db초기화 
-
-st.set_page_config(page_title="🐾 PetCare", layout="wide")
-
-
-#로그인 상태 확인 
-SESSION_KEY="auth_user"
-is_logged_in=SESSION_KEY in st.session_state
-user=st.session_state.get(SESSION_KEY)
-
-#메인홈페이지 제목 
-st.title("🐾 나만의 PetCare 홈")
-st.caption("좌측 Pages에서 기능을 선택하거나 아래 버튼으로 바로 이동하세요.")
-
-
-#로그인 상태에 따른 화면 표시
-if is_logged_in:
-    st.success(f"반갑습니다!")
-    if st.button("로그아웃"):
-        del st.session_state[SESSION_KEY]
-        st.rerun()
-
-    st.subheader("내 반려동물 관리")
-    st.page_link("pages/myprofile.py", label="내 프로필 관리", icon="🐾")
-    st.page_link("pages/profile.py", label="반려동물 등록", icon="➕")
-    st.page_link("pages/daily.py",label="반려동물 일일 기록",icon="📆")
-    st.page_link("pages/calender.py",label="캘린더",icon="⏰")
-    st.page_link("pages/album.py", label="포토 앨범",icon="📷")
-else:
-    st.info("로그인이 필요합니다. 아래 버튼으로 로그인 또는 회원가입을 진행하세요.")
-    st.page_link("pages/login.py", label="로그인하기")
-    st.page_link("pages/signup.py", label="회원가입하기")
-
+from core import telemetry
+
+#실행: streamlit run home.py
+#페이지 스크립트는 그대로 두고 여기서 고른 페이지를 실행하면서 rerun 1번을 span 하나로 계측 (core.telemetry)
+#pages/ 폴더가 있으면 Streamlit이 st.navigation 대신 폴더 자동 목록을 쓰므로 페이지는 app_pages/에 둠 (사이드바 순서: 홈 다음 파일 이름 순)
+PAGES = [
+    "app_pages/home.py",
+    "app_pages/album.py",
+    "app_pages/calender.py",
+    "app_pages/daily.py",
+    "app_pages/diagnostics.py",
+    "app_pages/login.py",
+    "app_pages/myprofile.py",
+    "app_pages/profile.py",
+    "app_pages/search.py",
+    "app_pages/signup.py",
+]
+
+pages = {path: st.Page(path, default=(path == PAGES[0])) for path in PAGES}
+page = st.navigation(list(pages.values()))
+with telemetry.page_span(next(path for path, p in pages.items() if p is page)):
+    page.run()